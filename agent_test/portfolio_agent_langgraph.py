@@ -22,6 +22,9 @@ from core.db import fetch_dicts
 from core.llm_clients import get_chat_model
 from jobs.seed_companies import INDUSTRY_CODE_MAP
 
+# ⭐ LLM JSON의 후행 쉼표 제거용 패턴 (응답마다 다시 컴파일하지 않도록 모듈 로드 시 한 번만)
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
 # =====================================================
 # State Definition
 # =====================================================
@@ -508,7 +511,7 @@ def analysis_node(state: AgentState) -> AgentState:
             print(f"✅ 작은따옴표 변환으로 파싱 성공")
         except json.JSONDecodeError:
             # 시도 2: 후행 쉼표 제거
-            json_str_fixed = re.sub(r',(\s*[}\]])', r'\1', json_str_fixed)
+            json_str_fixed = _TRAILING_COMMA.sub(r'\1', json_str_fixed)
             try:
                 result = json.loads(json_str_fixed)
                 print(f"✅ 후행 쉼표 제거로 파싱 성공")
@@ -8,7 +8,8 @@ portfolio_agent_multi.py
 - Supervisor (코디네이터)
 """
 
-from typing import Any, Dict, List, Optional, TypedDict, Literal, Annotated
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, TypedDict, Literal, Annotated
+import asyncio
 import json
 import re
 from datetime import datetime, timedelta
@@ -19,12 +20,15 @@ import numpy as np
 
 from langgraph.graph import StateGraph, END
 from langchain_core.tools import tool
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 
 from core.db import fetch_dicts
 from core.llm_clients import get_chat_model
 from jobs.seed_companies import INDUSTRY_CODE_MAP
 
+# ⭐ LLM JSON의 후행 쉼표 제거용 패턴 (응답마다 다시 컴파일하지 않도록 모듈 로드 시 한 번만)
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
 # =====================================================
 # 멀티 에이전트 State Definition
 # =====================================================
@@ -227,11 +231,227 @@ def get_company_info(ticker: str) -> Dict[str, Any]:
     }
 
 
+# =====================================================
+# 에이전트 시스템 프롬프트
+# =====================================================
+# ⭐ 역할/평가 기준/출력 형식은 요청마다 같으므로 시스템 메시지로 앞에 고정하고,
+#    투자 조건·종목 데이터처럼 바뀌는 부분만 사용자 메시지로 보냄 (LLM 제공자의 프롬프트 prefix 캐시 적중)
+
+FINANCIAL_SYSTEM_PROMPT = """당신은 **재무 분석 전문가**입니다.
+
+**임무:**
+각 종목에 대해 재무 건전성과 수익성을 평가하고, 0-100점의 **재무 점수**를 산출하세요.
+
+**평가 기준:**
+1. ROE (자기자본이익률): 15% 이상 우수 (가중치 30%)
+2. OPM (영업이익률): 10% 이상 우수 (가중치 20%)  
+3. 부채비율: 100% 이하 우수 (가중치 30%)
+4. 매출성장률: 20% 이상 우수 (가중치 20%)
+
+**출력 형식 (반드시 JSON):**
+```json
+{
+  "analysis_summary": "재무 분석 종합 의견 (2-3줄)",
+  "ticker_scores": {
+    "005930.KS": {
+      "financial_score": 85,
+      "roe_score": 90,
+      "opm_score": 75,
+      "debt_score": 85,
+      "growth_score": 80,
+      "comment": "ROE와 수익성이 우수하나 부채비율 관리 필요"
+    },
+    ...
+  },
+  "top_picks": ["005930.KS", "035420.KS"],
+  "risk_warnings": ["높은 부채비율 종목: ...]
+}
+```
+
+**중요:** 반드시 JSON 형식으로만 답변하고, 설명은 JSON 내부에 포함하세요."""
+
+TECHNICAL_SYSTEM_PROMPT = """당신은 **기술 분석 전문가**입니다.
+
+**임무:**
+각 종목에 대해 기술적 지표를 분석하고, 0-100점의 **기술적 점수**를 산출하세요.
+
+**평가 기준:**
+1. RSI (14일): 30-70 범위가 안정적 (가중치 30%)
+   - 과매수(>70): 조정 가능성
+   - 과매도(<30): 반등 가능성
+2. 모멘텀 (20일): 양수면 상승 추세 (가중치 30%)
+3. 이동평균선 (MA20/MA60): 현재가와 비교 (가중치 20%)
+   - 현재가 > MA20 > MA60: 강한 상승 추세
+   - MA20 > 현재가 > MA60: 조정 중
+   - MA60 > 현재가: 약세
+4. 변동성: 낮을수록 안정적 (가중치 20%)
+
+**출력 형식 (반드시 JSON):**
+```json
+{
+  "analysis_summary": "기술적 분석 종합 의견 (2-3줄)",
+  "ticker_scores": {
+    "005930.KS": {
+      "technical_score": 78,
+      "rsi_score": 80,
+      "momentum_score": 75,
+      "ma_score": 85,
+      "volatility_score": 70,
+      "signal": "매수",
+      "comment": "RSI 안정권, 상승 모멘텀 유지, MA20 돌파"
+    },
+    ...
+  },
+  "buy_signals": ["005930.KS"],
+  "sell_signals": [],
+  "hold_signals": ["035420.KS"]
+}
+```
+
+**중요:** 반드시 JSON 형식으로만 답변하세요."""
+
+NEWS_SYSTEM_PROMPT = """당신은 **뉴스 및 산업 동향 분석 전문가**입니다.
+
+**임무:**
+각 종목에 대해 산업 동향과 뉴스 전망을 분석하고, 0-100점의 **뉴스 점수**를 산출하세요.
+
+**평가 기준:**
+1. 산업 성장성: 해당 섹터의 장기 성장 전망 (가중치 40%)
+2. 정책 지원: 정부 정책 및 규제 환경 (가중치 20%)
+3. 시장 수요: 제품/서비스 수요 추세 (가중치 25%)
+4. 경쟁 환경: 시장 점유율 및 경쟁 강도 (가중치 15%)
+
+**출력 형식 (반드시 JSON):**
+```json
+{
+  "analysis_summary": "뉴스 분석 종합 의견 (2-3줄)",
+  "ticker_scores": {
+    "005930": {
+      "news_score": 88,
+      "industry_growth_score": 90,
+      "policy_support_score": 85,
+      "market_demand_score": 90,
+      "competition_score": 80,
+      "sentiment": "positive",
+      "comment": "AI 반도체 수요 급증으로 장기 성장 전망 밝음"
+    },
+    ...
+  },
+  "sector_outlook": {
+    "반도체": "매우 긍정적",
+    "바이오": "긍정적"
+  }
+}
+```
+
+**중요:** 반드시 JSON 형식으로만 답변하세요."""
+
+SUPERVISOR_SYSTEM_PROMPT = """당신은 **투자 포트폴리오 매니저 (Supervisor)**입니다.
+3명의 전문가가 종목을 분석했습니다. 이들의 의견을 종합하여 최종 포트폴리오를 구성하세요.
+
+**수행할 작업:**
+1. 사용자 메시지의 투자 조건에 맞춰 선택된 종목들을 분석
+2. 예산 범위 내에서 투자 성향과 기간에 적합한 포트폴리오 구성
+3. 성과 지표 계산
+
+**📊 chart_data 필수 구조:**
+1. sunburst: 계층형 차트 데이터 (섹터 → 종목)
+   - ⚠️ **섹터명은 사용자 메시지의 "종목-섹터 매핑"에 있는 sector 값을 정확히 사용**
+   - 루트 섹터: {"name": "섹터명", "value": 비중}
+   - 하위 종목: {"name": "종목명", "value": 비중, "parent": "섹터명"}
+2. expected_performance: 수익률 예측 차트
+   - months: [1, 3, 6, 12] (고정)
+   - portfolio: 포트폴리오 예상 수익률
+   - benchmark: 벤치마크(KOSPI) 예상 수익률
+- 예시:
+  ```json
+  {
+  "ai_summary": `  삼성전자(45%), NAVER(30%), 한화오션(25%)으로 구성된 포트폴리오로, IT·조선 등 산업을 고르게 분산해 경기순환 리스크를 완화한 중립형 전략입니다.
+  투자 전략은 1년을 기준으로 단계적으로 운영됩니다. 1~3개월 차에는 실적 발표 및 AI 반도체 수요 변화를 모니터링하고, 6개월 시점에는 일정 수익 실현과 함께 NAVER 비중 확대를 검토합니다. 
+  12개월 이후에는 경기 회복 국면에 맞춰 삼성전자 중심으로 리밸런싱을 계획하고 있습니다.  종합 평가 결과 82점으로, AI 산업 성장에 따른 장기적 수익성을 노리는 중립형 투자자에게 적합한 포트폴리오로 판단됩니다.`,
+    "portfolio_allocation": [
+      {
+        "ticker": "068270.KS",
+        "name": "효성중공업",
+        "sector": "전력망",
+        "weight": 0.25,
+        "amount": 12500000,
+        "shares": 1000,
+        "current_price": 12500,
+        "target_price": 15000,
+        "stop_loss": 11000,
+        "scores": {
+          "data_analysis": 75,
+          "financial": 78,
+          "news": 72
+        }
+      }
+    ],
+    "performance_metrics": {
+      "expected_return": 15.5,
+      "max_drawdown": -12.3,
+      "sharpe_ratio": 1.2,
+      "benchmark_alpha": 5.0
+    },
+    "chart_data": {
+      "sunburst": [
+        {"name": "반도체", "value": 0.50},
+        {"name": "삼성전자", "value": 0.30, "parent": "반도체"},
+        {"name": "SK하이닉스", "value": 0.20, "parent": "반도체"},
+        {"name": "전력망", "value": 0.30},
+        {"name": "효성중공업", "value": 0.30, "parent": "전력망"},
+        {"name": "바이오", "value": 0.20},
+        {"name": "셀트리온", "value": 0.20, "parent": "바이오"}
+      ],
+      "expected_performance": {
+        "months": [1, 3, 6, 12],
+        "portfolio": [2.0, 6.0, 11.0, 15.5],
+        "benchmark": [1.0, 3.0, 5.5, 10.0]
+      }
+    }
+  }
+```
+
+반드시 이 JSON 형식으로 결과를 제시하세요."""
+
+
+# ⭐ Anthropic은 cache_control 표시가 있어야 프롬프트 prefix를 캐시하므로 ChatAnthropic일 때만 붙임
+#    (get_chat_model에는 아직 Anthropic 제공자가 없음, langchain_anthropic을 import하지 않도록 클래스 이름으로 판별)
+def _system_message(prompt: str, llm) -> SystemMessage:
+    """시스템 프롬프트 메시지 생성 (Anthropic이면 ephemeral 캐시 블록으로)"""
+    if type(llm).__name__ == "ChatAnthropic":
+        return SystemMessage(content=[
+            {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=prompt)
+
+
 # =====================================================
 # 에이전트 노드들
 # =====================================================
 
-def initialization_node(state: MultiAgentState) -> MultiAgentState:
+# 초기화 단계에서 동시에 조회할 종목 수 (종목마다 DB 연결을 새로 열기 때문에 상한을 둠)
+INIT_FETCH_CONCURRENCY = 8
+
+
+def _load_ticker_data(ticker: str) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict], Optional[Dict]]:
+    """종목 하나의 (기업 정보, 주가, 재무 지표, 기술적 지표) 조회 - 실패한 항목은 None"""
+    info_result = get_company_info.invoke({"ticker": ticker})
+    if "error" in info_result:
+        return None, None, None, None
+    
+    price_result = get_stock_prices.invoke({"ticker": ticker})
+    fin_result = get_financial_metrics.invoke({"ticker": ticker})
+    tech_result = get_technical_signals.invoke({"ticker": ticker})
+    return (
+        info_result,
+        None if "error" in price_result else price_result,
+        None if "error" in fin_result else fin_result,
+        None if "error" in tech_result else tech_result,
+    )
+
+
+async def initialization_node(state: MultiAgentState) -> MultiAgentState:
     """초기화: 선택된 종목의 기본 정보 및 주가 데이터 수집"""
     print("\n" + "="*60)
     print("🚀 멀티 에이전트 포트폴리오 분석 시작")
@@ -262,32 +482,29 @@ def initialization_node(state: MultiAgentState) -> MultiAgentState:
         tickers.update(ticker_list)
     
     # 기본 정보, 주가, 재무, 기술적 지표 데이터 수집
+    # ⭐ 종목마다 독립적인 DB 조회이므로 스레드로 동시에 실행 (동시 연결 수는 세마포어로 제한)
+    semaphore = asyncio.Semaphore(INIT_FETCH_CONCURRENCY)
+    
+    async def load(ticker):
+        async with semaphore:
+            return ticker, await asyncio.to_thread(_load_ticker_data, ticker)
+    
     company_infos = {}
     stock_prices = {}
     financial_metrics = {}
     technical_signals = {}
     
-    for ticker in tickers:
-        # 기업 정보
-        info_result = get_company_info.invoke({"ticker": ticker})
-        if "error" not in info_result:
-            company_infos[ticker] = info_result
-            print(f"  ✓ {info_result['name']} ({info_result['sector']})")
-            
-            # 주가 데이터
-            price_result = get_stock_prices.invoke({"ticker": ticker})
-            if "error" not in price_result:
-                stock_prices[ticker] = price_result
-            
-            # 재무 지표
-            fin_result = get_financial_metrics.invoke({"ticker": ticker})
-            if "error" not in fin_result:
-                financial_metrics[ticker] = fin_result
-            
-            # 기술적 지표
-            tech_result = get_technical_signals.invoke({"ticker": ticker})
-            if "error" not in tech_result:
-                technical_signals[ticker] = tech_result
+    for ticker, (info, price, fin, tech) in await asyncio.gather(*(load(t) for t in tickers)):
+        if info is None:
+            continue
+        company_infos[ticker] = info
+        print(f"  ✓ {info['name']} ({info['sector']})")
+        if price is not None:
+            stock_prices[ticker] = price
+        if fin is not None:
+            financial_metrics[ticker] = fin
+        if tech is not None:
+            technical_signals[ticker] = tech
     
     state["company_infos"] = company_infos
     state["stock_prices"] = stock_prices
@@ -302,7 +519,7 @@ def initialization_node(state: MultiAgentState) -> MultiAgentState:
     return state
 
 
-def financial_agent_node(state: MultiAgentState) -> MultiAgentState:
+async def financial_agent_node(state: MultiAgentState) -> MultiAgentState:
     """
     재무 분석 전문가 에이전트
     - ROE, 영업이익률, 부채비율, 매출성장률 분석
@@ -335,47 +552,14 @@ def financial_agent_node(state: MultiAgentState) -> MultiAgentState:
         print(f"  ✓ {ticker}: ROE {fin_data.get('roe')}%, 부채비율 {fin_data.get('debt_ratio')}%, 현재가 {fin_data.get('current_price', 'N/A')}")
     
     # LLM에게 재무 분석 요청
-    prompt = f"""당신은 **재무 분석 전문가**입니다.
-
-**투자 조건:**
+    prompt = f"""**투자 조건:**
 - 투자 성향: {state['risk_profile']}
 - 투자 기간: {state['investment_period']}
 
 **분석할 종목들:**
-{json.dumps(financial_data, ensure_ascii=False, indent=2)}
-
-**임무:**
-각 종목에 대해 재무 건전성과 수익성을 평가하고, 0-100점의 **재무 점수**를 산출하세요.
-
-**평가 기준:**
-1. ROE (자기자본이익률): 15% 이상 우수 (가중치 30%)
-2. OPM (영업이익률): 10% 이상 우수 (가중치 20%)  
-3. 부채비율: 100% 이하 우수 (가중치 30%)
-4. 매출성장률: 20% 이상 우수 (가중치 20%)
-
-**출력 형식 (반드시 JSON):**
-```json
-{{
-  "analysis_summary": "재무 분석 종합 의견 (2-3줄)",
-  "ticker_scores": {{
-    "005930.KS": {{
-      "financial_score": 85,
-      "roe_score": 90,
-      "opm_score": 75,
-      "debt_score": 85,
-      "growth_score": 80,
-      "comment": "ROE와 수익성이 우수하나 부채비율 관리 필요"
-    }},
-    ...
-  }},
-  "top_picks": ["005930.KS", "035420.KS"],
-  "risk_warnings": ["높은 부채비율 종목: ...]
-}}
-```
-
-**중요:** 반드시 JSON 형식으로만 답변하고, 설명은 JSON 내부에 포함하세요."""
+{json.dumps(financial_data, ensure_ascii=False, indent=2)}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await llm.ainvoke([_system_message(FINANCIAL_SYSTEM_PROMPT, llm), HumanMessage(content=prompt)])
     response_text = response.content
     
     # JSON 파싱
@@ -411,7 +595,7 @@ def financial_agent_node(state: MultiAgentState) -> MultiAgentState:
     }
 
 
-def technical_agent_node(state: MultiAgentState) -> MultiAgentState:
+async def technical_agent_node(state: MultiAgentState) -> MultiAgentState:
     """
     기술 분석 전문가 에이전트
     - RSI, 모멘텀, 변동성 분석
@@ -445,54 +629,14 @@ def technical_agent_node(state: MultiAgentState) -> MultiAgentState:
         print(f"  ✓ {ticker}: RSI {tech_data.get('rsi14')}, 모멘텀 {tech_data.get('momentum_20d')}%")
     
     # LLM에게 기술 분석 요청
-    prompt = f"""당신은 **기술 분석 전문가**입니다.
-
-**투자 조건:**
+    prompt = f"""**투자 조건:**
 - 투자 성향: {state['risk_profile']}
 - 투자 기간: {state['investment_period']}
 
 **분석할 종목들:**
-{json.dumps(technical_data, ensure_ascii=False, indent=2)}
-
-**임무:**
-각 종목에 대해 기술적 지표를 분석하고, 0-100점의 **기술적 점수**를 산출하세요.
+{json.dumps(technical_data, ensure_ascii=False, indent=2)}"""
 
-**평가 기준:**
-1. RSI (14일): 30-70 범위가 안정적 (가중치 30%)
-   - 과매수(>70): 조정 가능성
-   - 과매도(<30): 반등 가능성
-2. 모멘텀 (20일): 양수면 상승 추세 (가중치 30%)
-3. 이동평균선 (MA20/MA60): 현재가와 비교 (가중치 20%)
-   - 현재가 > MA20 > MA60: 강한 상승 추세
-   - MA20 > 현재가 > MA60: 조정 중
-   - MA60 > 현재가: 약세
-4. 변동성: 낮을수록 안정적 (가중치 20%)
-
-**출력 형식 (반드시 JSON):**
-```json
-{{
-  "analysis_summary": "기술적 분석 종합 의견 (2-3줄)",
-  "ticker_scores": {{
-    "005930.KS": {{
-      "technical_score": 78,
-      "rsi_score": 80,
-      "momentum_score": 75,
-      "ma_score": 85,
-      "volatility_score": 70,
-      "signal": "매수",
-      "comment": "RSI 안정권, 상승 모멘텀 유지, MA20 돌파"
-    }},
-    ...
-  }},
-  "buy_signals": ["005930.KS"],
-  "sell_signals": [],
-  "hold_signals": ["035420.KS"]
-}}
-```
-
-**중요:** 반드시 JSON 형식으로만 답변하세요."""
-
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await llm.ainvoke([_system_message(TECHNICAL_SYSTEM_PROMPT, llm), HumanMessage(content=prompt)])
     response_text = response.content
     
     # JSON 파싱
@@ -530,7 +674,7 @@ def technical_agent_node(state: MultiAgentState) -> MultiAgentState:
     }
 
 
-def news_agent_node(state: MultiAgentState) -> MultiAgentState:
+async def news_agent_node(state: MultiAgentState) -> MultiAgentState:
     """
     뉴스 분석 전문가 에이전트
     - 산업 동향 분석
@@ -566,9 +710,7 @@ def news_agent_node(state: MultiAgentState) -> MultiAgentState:
         }
     
     # LLM에게 뉴스 분석 요청
-    prompt = f"""당신은 **뉴스 및 산업 동향 분석 전문가**입니다.
-
-**투자 조건:**
+    prompt = f"""**투자 조건:**
 - 투자 성향: {state['risk_profile']}
 - 투자 기간: {state['investment_period']}
 
@@ -576,43 +718,9 @@ def news_agent_node(state: MultiAgentState) -> MultiAgentState:
 {json.dumps({
     "companies": company_data,
     "sector_trends": sector_trends
-}, ensure_ascii=False, indent=2)}
-
-**임무:**
-각 종목에 대해 산업 동향과 뉴스 전망을 분석하고, 0-100점의 **뉴스 점수**를 산출하세요.
+}, ensure_ascii=False, indent=2)}"""
 
-**평가 기준:**
-1. 산업 성장성: 해당 섹터의 장기 성장 전망 (가중치 40%)
-2. 정책 지원: 정부 정책 및 규제 환경 (가중치 20%)
-3. 시장 수요: 제품/서비스 수요 추세 (가중치 25%)
-4. 경쟁 환경: 시장 점유율 및 경쟁 강도 (가중치 15%)
-
-**출력 형식 (반드시 JSON):**
-```json
-{{
-  "analysis_summary": "뉴스 분석 종합 의견 (2-3줄)",
-  "ticker_scores": {{
-    "005930": {{
-      "news_score": 88,
-      "industry_growth_score": 90,
-      "policy_support_score": 85,
-      "market_demand_score": 90,
-      "competition_score": 80,
-      "sentiment": "positive",
-      "comment": "AI 반도체 수요 급증으로 장기 성장 전망 밝음"
-    }},
-    ...
-  }},
-  "sector_outlook": {{
-    "반도체": "매우 긍정적",
-    "바이오": "긍정적"
-  }}
-}}
-```
-
-**중요:** 반드시 JSON 형식으로만 답변하세요."""
-
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await llm.ainvoke([_system_message(NEWS_SYSTEM_PROMPT, llm), HumanMessage(content=prompt)])
     response_text = response.content
     
     # JSON 파싱
@@ -706,7 +814,7 @@ def validation_node(state: MultiAgentState) -> MultiAgentState:
     return state
 
 
-def supervisor_node(state: MultiAgentState) -> MultiAgentState:
+async def supervisor_node(state: MultiAgentState) -> MultiAgentState:
     """
     Supervisor (총괄 매니저) 에이전트
     - 3명의 전문가 의견을 통합
@@ -749,10 +857,7 @@ def supervisor_node(state: MultiAgentState) -> MultiAgentState:
         print(f"  - {ticker}: {data['name']} → 섹터: {data['sector']}")
     
     # Supervisor 프롬프트
-    prompt = f"""당신은 **투자 포트폴리오 매니저 (Supervisor)**입니다.
-3명의 전문가가 종목을 분석했습니다. 이들의 의견을 종합하여 최종 포트폴리오를 구성하세요.
-
-**투자 조건:**
+    prompt = f"""**투자 조건:**
 - 투자 예산: {state['budget']:,}원
 - 투자 성향: {state['risk_profile']} (안정: 낮은 변동성 선호, 중립: 균형잡힌 접근, 공격: 높은 수익률 추구)
 - 투자 기간: {state['investment_period']} (단기: 3개월 이하, 중기: 3개월~1년, 장기: 1년 이상)
@@ -770,74 +875,9 @@ def supervisor_node(state: MultiAgentState) -> MultiAgentState:
 {json.dumps(technical, ensure_ascii=False, indent=2)}
 
 3️⃣ 뉴스 분석 전문가:
-{json.dumps(news, ensure_ascii=False, indent=2)}
-
-**수행할 작업:**
-1. 위 투자 조건에 맞춰 선택된 종목들을 분석
-2. 예산 범위 내에서 투자 성향과 기간에 적합한 포트폴리오 구성
-3. 성과 지표 계산
+{json.dumps(news, ensure_ascii=False, indent=2)}"""
 
-**📊 chart_data 필수 구조:**
-1. sunburst: 계층형 차트 데이터 (섹터 → 종목)
-   - ⚠️ **섹터명은 위 "종목-섹터 매핑"에 있는 sector 값을 정확히 사용**
-   - 루트 섹터: {{"name": "섹터명", "value": 비중}}
-   - 하위 종목: {{"name": "종목명", "value": 비중, "parent": "섹터명"}}
-2. expected_performance: 수익률 예측 차트
-   - months: [1, 3, 6, 12] (고정)
-   - portfolio: 포트폴리오 예상 수익률
-   - benchmark: 벤치마크(KOSPI) 예상 수익률
-- 예시:
-  ```json
-  {{
-  "ai_summary": `  삼성전자(45%), NAVER(30%), 한화오션(25%)으로 구성된 포트폴리오로, IT·조선 등 산업을 고르게 분산해 경기순환 리스크를 완화한 중립형 전략입니다.
-  투자 전략은 1년을 기준으로 단계적으로 운영됩니다. 1~3개월 차에는 실적 발표 및 AI 반도체 수요 변화를 모니터링하고, 6개월 시점에는 일정 수익 실현과 함께 NAVER 비중 확대를 검토합니다. 
-  12개월 이후에는 경기 회복 국면에 맞춰 삼성전자 중심으로 리밸런싱을 계획하고 있습니다.  종합 평가 결과 82점으로, AI 산업 성장에 따른 장기적 수익성을 노리는 중립형 투자자에게 적합한 포트폴리오로 판단됩니다.`,
-    "portfolio_allocation": [
-      {{
-        "ticker": "068270.KS",
-        "name": "효성중공업",
-        "sector": "전력망",
-        "weight": 0.25,
-        "amount": 12500000,
-        "shares": 1000,
-        "current_price": 12500,
-        "target_price": 15000,
-        "stop_loss": 11000,
-        "scores": {{
-          "data_analysis": 75,
-          "financial": 78,
-          "news": 72
-        }}
-      }}
-    ],
-    "performance_metrics": {{
-      "expected_return": 15.5,
-      "max_drawdown": -12.3,
-      "sharpe_ratio": 1.2,
-      "benchmark_alpha": 5.0
-    }},
-    "chart_data": {{
-      "sunburst": [
-        {{"name": "반도체", "value": 0.50}},
-        {{"name": "삼성전자", "value": 0.30, "parent": "반도체"}},
-        {{"name": "SK하이닉스", "value": 0.20, "parent": "반도체"}},
-        {{"name": "전력망", "value": 0.30}},
-        {{"name": "효성중공업", "value": 0.30, "parent": "전력망"}},
-        {{"name": "바이오", "value": 0.20}},
-        {{"name": "셀트리온", "value": 0.20, "parent": "바이오"}}
-      ],
-      "expected_performance": {{
-        "months": [1, 3, 6, 12],
-        "portfolio": [2.0, 6.0, 11.0, 15.5],
-        "benchmark": [1.0, 3.0, 5.5, 10.0]
-      }}
-    }}
-  }}
-```
-
-반드시 위의 JSON 형식으로 결과를 제시하세요."""
-
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = await llm.ainvoke([_system_message(SUPERVISOR_SYSTEM_PROMPT, llm), HumanMessage(content=prompt)])
     response_text = response.content
     
     # JSON 파싱
@@ -852,7 +892,7 @@ def supervisor_node(state: MultiAgentState) -> MultiAgentState:
         
         # JSON 정리
         json_str_fixed = json_str.replace("'", '"')
-        json_str_fixed = re.sub(r',(\s*[}\]])', r'\1', json_str_fixed)
+        json_str_fixed = _TRAILING_COMMA.sub(r'\1', json_str_fixed)
         
         result = json.loads(json_str_fixed)
         
@@ -962,22 +1002,15 @@ def build_multi_agent_graph():
 # 실행 함수
 # =====================================================
 
-def run_multi_agent_portfolio(
+def _build_initial_state(
     budget: int,
     investment_targets: Dict[str, List[str]],
     risk_profile: str,
     investment_period: str,
     additional_prompt: str = "",
-    model_name: str = None  # ⭐ 모델 선택 파라미터 추가
-) -> Dict[str, Any]:
-    """멀티 에이전트 포트폴리오 분석 실행"""
-    
-    print(f"\n{'='*60}")
-    print(f"🤖 멀티 에이전트 포트폴리오 분석 시작")
-    print(f"{'='*60}")
-    
-    graph = build_multi_agent_graph()
-    
+    model_name: str = None
+) -> MultiAgentState:
+    """그래프 실행용 초기 상태 생성"""
     # ⭐ model_name이 없으면 기본값 사용
     if not model_name:
         from core.llm_clients import AVAILABLE_MODELS
@@ -985,7 +1018,7 @@ def run_multi_agent_portfolio(
     
     print(f"🔧 사용 모델: {model_name}")
     
-    initial_state: MultiAgentState = {
+    return {
         "budget": budget,
         "investment_targets": investment_targets,
         "risk_profile": risk_profile,
@@ -1013,13 +1046,10 @@ def run_multi_agent_portfolio(
         "messages": [],
         "iteration": 0
     }
-    
-    final_state = graph.invoke(initial_state)
-    
-    print(f"\n{'='*60}")
-    print(f"✅ 멀티 에이전트 분석 완료!")
-    print(f"{'='*60}\n")
-    
+
+
+def _build_result(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """최종 상태에서 API 응답용 결과만 추출"""
     return {
         "success": True,
         "ai_summary": final_state.get("ai_summary"),
@@ -1030,6 +1060,90 @@ def run_multi_agent_portfolio(
     }
 
 
+async def arun_multi_agent_portfolio(
+    budget: int,
+    investment_targets: Dict[str, List[str]],
+    risk_profile: str,
+    investment_period: str,
+    additional_prompt: str = "",
+    model_name: str = None  # ⭐ 모델 선택 파라미터 추가
+) -> Dict[str, Any]:
+    """멀티 에이전트 포트폴리오 분석 실행 (비동기)
+    
+    ⭐ 전문가 노드들은 llm.ainvoke로 LLM을 호출하므로, 병렬 분기의 LLM 요청이
+    스레드 없이 이벤트 루프 위에서 동시에 진행됩니다.
+    """
+    
+    print(f"\n{'='*60}")
+    print(f"🤖 멀티 에이전트 포트폴리오 분석 시작")
+    print(f"{'='*60}")
+    
+    graph = build_multi_agent_graph()
+    initial_state = _build_initial_state(
+        budget, investment_targets, risk_profile, investment_period, additional_prompt, model_name
+    )
+    
+    final_state = await graph.ainvoke(initial_state)
+    
+    print(f"\n{'='*60}")
+    print(f"✅ 멀티 에이전트 분석 완료!")
+    print(f"{'='*60}\n")
+    
+    return _build_result(final_state)
+
+
+def run_multi_agent_portfolio(
+    budget: int,
+    investment_targets: Dict[str, List[str]],
+    risk_profile: str,
+    investment_period: str,
+    additional_prompt: str = "",
+    model_name: str = None
+) -> Dict[str, Any]:
+    """멀티 에이전트 포트폴리오 분석 실행 (스크립트 등 동기 코드용 래퍼)"""
+    return asyncio.run(arun_multi_agent_portfolio(
+        budget, investment_targets, risk_profile, investment_period, additional_prompt, model_name
+    ))
+
+
+async def astream_multi_agent_portfolio(
+    budget: int,
+    investment_targets: Dict[str, List[str]],
+    risk_profile: str,
+    investment_period: str,
+    additional_prompt: str = "",
+    model_name: str = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    멀티 에이전트 포트폴리오 분석을 단계별로 실행 (비동기)
+    
+    노드 하나가 끝날 때마다 (노드명, 해당 노드가 갱신한 상태)를 yield하고,
+    마지막에 ("result", arun_multi_agent_portfolio와 같은 형식의 결과)를 yield합니다.
+    """
+    print(f"\n{'='*60}")
+    print(f"🤖 멀티 에이전트 포트폴리오 분석 시작 (스트리밍)")
+    print(f"{'='*60}")
+    
+    graph = build_multi_agent_graph()
+    initial_state = _build_initial_state(
+        budget, investment_targets, risk_profile, investment_period, additional_prompt, model_name
+    )
+    
+    # stream_mode="updates"는 노드별 변경분만 주므로 최종 상태는 직접 누적
+    final_state = dict(initial_state)
+    async for chunk in graph.astream(initial_state, stream_mode="updates"):
+        for node_name, update in chunk.items():
+            update = update or {}
+            final_state.update(update)
+            yield node_name, update
+    
+    print(f"\n{'='*60}")
+    print(f"✅ 멀티 에이전트 분석 완료!")
+    print(f"{'='*60}\n")
+    
+    yield "result", _build_result(final_state)
+
+
 # =====================================================
 # 테스트 코드
 # =====================================================
@@ -1,35 +1,39 @@
 import os
+import logging
 from langchain_core.language_models import BaseChatModel
 from typing import List, Dict
 
+# ⭐ [DEBUG] print 대신 로거 사용 (기본 레벨에서는 debug 로그를 포맷/출력하지 않음)
+logger = logging.getLogger("portfolio.llm")
+
 # --- .env 파일에서 LLM 공급자별 API 키와 모델 이름을 "미리" 읽어옵니다. ---
 # (main.py에서 load_dotenv()를 실행한 *이후*에 이 파일이 임포트되어야 합니다.)
 
 # 1. Upstage
 UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY")
 UPSTAGE_MODEL_NAME = os.getenv("LLM_PROVIDER_UPSTAGE_MODEL", "solar-pro2") 
-print(f"[DEBUG] UPSTAGE_API_KEY loaded: {bool(UPSTAGE_API_KEY)}")
-print(f"[DEBUG] UPSTAGE_MODEL_NAME: {UPSTAGE_MODEL_NAME}")
+logger.debug("UPSTAGE_API_KEY loaded: %s", bool(UPSTAGE_API_KEY))
+logger.debug("UPSTAGE_MODEL_NAME: %s", UPSTAGE_MODEL_NAME)
 
 # 2. OpenAI 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL_NAME = os.getenv("LLM_PROVIDER_OPENAI_MODEL", "gpt-4o")
-print(f"[DEBUG] OPENAI_API_KEY loaded: {bool(OPENAI_API_KEY)}")
-print(f"[DEBUG] OPENAI_MODEL_NAME: {OPENAI_MODEL_NAME}")
+logger.debug("OPENAI_API_KEY loaded: %s", bool(OPENAI_API_KEY))
+logger.debug("OPENAI_MODEL_NAME: %s", OPENAI_MODEL_NAME)
 
 # 3. Google Gemini 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEMINI_MODEL_NAME = os.getenv("LLM_PROVIDER_GEMINI_MODEL", "gemini-2.5-pro")
-print(f"[DEBUG] GOOGLE_API_KEY loaded: {bool(GOOGLE_API_KEY)}")
-print(f"[DEBUG] GEMINI_MODEL_NAME: {GEMINI_MODEL_NAME}")
+logger.debug("GOOGLE_API_KEY loaded: %s", bool(GOOGLE_API_KEY))
+logger.debug("GEMINI_MODEL_NAME: %s", GEMINI_MODEL_NAME)
 
 
 # 4. GROQ
 # GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_API_KEY = None
 GROQ_MODEL_NAME = os.getenv("LLM_PROVIDER_GROQ_MODEL", "llama-3.3-70b-versatile")
-print(f"[DEBUG] GROQ_API_KEY loaded: {bool(GROQ_API_KEY)}")
-print(f"[DEBUG] GROQ_MODEL_NAME: {GROQ_MODEL_NAME}")
+logger.debug("GROQ_API_KEY loaded: %s", bool(GROQ_API_KEY))
+logger.debug("GROQ_MODEL_NAME: %s", GROQ_MODEL_NAME)
 
 
 # --- 사용 가능한 모델의 "전체 목록" ---
@@ -55,7 +59,7 @@ def get_chat_model(model_name: str) -> BaseChatModel:
     LLM 팩토리: .env 파일과 모델 이름을 기반으로
     올바른 LLM 클라이언트(Upstage, OpenAI, Gemini 등)를 반환합니다.
     """
-    print(f"[DEBUG] get_chat_model called with model_name: '{model_name}'")
+    logger.debug("get_chat_model called with model_name: '%s'", model_name)
     
     # --- 각 모델에 대한 클라이언트 생성 로직 ---
     # (API 키가 있는 모델만 실제로 생성됩니다.)
@@ -63,7 +67,7 @@ def get_chat_model(model_name: str) -> BaseChatModel:
     if model_name == UPSTAGE_MODEL_NAME and UPSTAGE_API_KEY:
         # Upstage는 OpenAI와 API 호환이 되므로 ChatOpenAI를 사용합니다.
         from langchain_openai import ChatOpenAI
-        print(f"--- [LLM Factory] Upstage '{model_name}' 모델을 로드합니다. ---")
+        logger.debug("[LLM Factory] Upstage '%s' 모델을 로드합니다.", model_name)
         return ChatOpenAI(
             model=model_name,
             api_key=UPSTAGE_API_KEY,
@@ -73,7 +77,7 @@ def get_chat_model(model_name: str) -> BaseChatModel:
     elif model_name == OPENAI_MODEL_NAME and OPENAI_API_KEY:
         # OpenAI (새로 추가!)
         from langchain_openai import ChatOpenAI
-        print(f"--- [LLM Factory] OpenAI '{model_name}' 모델을 로드합니다. ---")
+        logger.debug("[LLM Factory] OpenAI '%s' 모델을 로드합니다.", model_name)
         return ChatOpenAI(
             model=model_name,
             api_key=OPENAI_API_KEY
@@ -82,7 +86,7 @@ def get_chat_model(model_name: str) -> BaseChatModel:
     elif model_name == GEMINI_MODEL_NAME and GOOGLE_API_KEY:
         # Google Gemini
         from langchain_google_genai import ChatGoogleGenerativeAI
-        print(f"--- [LLM Factory] Google '{model_name}' 모델을 로드합니다. ---")
+        logger.debug("[LLM Factory] Google '%s' 모델을 로드합니다.", model_name)
         return ChatGoogleGenerativeAI(
             model=model_name,
             google_api_key=GOOGLE_API_KEY
@@ -91,7 +95,7 @@ def get_chat_model(model_name: str) -> BaseChatModel:
     elif model_name == GROQ_MODEL_NAME and GROQ_API_KEY:
         # Groq
         from langchain_groq import ChatGroq
-        print(f"--- [LLM Factory] Groq '{model_name}' 모델을 로드합니다. ---")
+        logger.debug("[LLM Factory] Groq '%s' 모델을 로드합니다.", model_name)
         return ChatGroq(
             model_name=model_name,
             groq_api_key=GROQ_API_KEY
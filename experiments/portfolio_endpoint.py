@@ -4,43 +4,335 @@ main.py
 Portfolio Analysis System v2 - 고도화된 입출력 구조
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse, FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Literal
-import plotly.graph_objects as go
-from plotly.io import to_html
 import json
+import orjson
+import os
+import hashlib
+import gzip
+import html
 import re
-import traceback
+try:
+    import brotli  # 선택 의존성: 설치되어 있으면 메인 페이지를 br로도 미리 압축
+except ImportError:
+    brotli = None
+import asyncio
+from contextlib import asynccontextmanager
+import logging
 # import pdfkit  # ⭐ 제거됨
-from playwright.sync_api import sync_playwright
-import io
-from datetime import datetime
+import time
+import itertools
+from collections import defaultdict, OrderedDict
 
 from agent_test.portfolio_agent_anthropic import run_portfolio_agent, AVAILABLE_STOCKS, SECTORS
 from agent_test.portfolio_agent_langgraph import run_portfolio_agent_langgraph
-from agent_test.portfolio_agent_multi import run_multi_agent_portfolio
+from agent_test.portfolio_agent_multi import arun_multi_agent_portfolio, astream_multi_agent_portfolio
 
 from core.llm_clients import AVAILABLE_MODELS
 
-app = FastAPI(title="AI 투자 포트폴리오 분석 시스템 v2")
+# ⭐ 요청마다 찍던 print 배너 대신 로거 사용 (기본 레벨에서는 debug 로그를 포맷/출력하지 않음)
+logger = logging.getLogger("portfolio")
+
+# ⭐ PDF용 Chromium은 프로세스 수명 동안 하나만 띄워 두고, 그 위의 BrowserContext 풀을 요청들이 나눠 씀
+# (--single-process/--no-zygote는 컨텍스트 여러 개를 동시에 쓰는 풀과 같이 쓰면 불안정해서 제외)
+PDF_BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--mute-audio",
+    "--hide-scrollbars",
+]
+PDF_POOL_SIZE = int(os.getenv("PDF_POOL_SIZE", "4"))            # 동시에 렌더링할 수 있는 PDF 수
+PDF_CONTEXT_MAX_USES = int(os.getenv("PDF_CONTEXT_MAX_USES", "50"))  # 이 횟수만큼 쓰면 컨텍스트 교체 (메모리 상한)
+PDF_FONT_WAIT_MS = 5000  # 웹폰트 로딩을 기다리는 최대 시간
+PDF_RENDER_TIMEOUT_S = 30  # 페이지 한 장을 PDF로 만드는 전체 제한 시간
+_PDF_SEQ = itertools.count()  # ⭐ 같은 초에 받은 PDF끼리 파일명이 겹치지 않도록 붙이는 일련번호
+
+
+class LRU(OrderedDict):
+    """크기 제한이 있는 LRU 캐시 (가장 오래 안 쓴 항목부터 제거)"""
+    
+    def __init__(self, maxsize=32):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+    
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class TTLCache(LRU):
+    """항목마다 유효 시간이 있는 LRU 캐시 (만료된 항목은 조회 시 제거)"""
+    
+    def __init__(self, maxsize=256, ttl=900):
+        super().__init__(maxsize)
+        self.ttl = ttl
+    
+    def get(self, key, default=None):
+        item = super().get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self[key]
+            return default
+        return value
+    
+    def put(self, key, value):
+        super().put(key, (time.monotonic() + self.ttl, value))
+
+
+# ⭐ 같은 HTML로 다시 요청하면(재클릭/재시도) Chromium 렌더링 없이 캐시된 PDF 반환
+PDF_CACHE = LRU(maxsize=int(os.getenv("PDF_CACHE_SIZE", "32")))
 
-# 정적 파일 (CSS, JS) 서빙 설정
+
+class BrowserPool:
+    """공유 브라우저 위의 BrowserContext 풀
+    
+    - 풀 크기만큼만 동시에 렌더링 (나머지 요청은 큐에서 대기)
+    - 컨텍스트를 max_uses번 사용하면 닫고 새로 만들어 메모리 증가를 막음
+    - 새 컨텍스트를 만들지 못하면 빈 슬롯으로 두고 다음 acquire()에서 다시 만듦
+    """
+    
+    def __init__(self, browser, size, max_uses):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self._queue = asyncio.Queue()
+    
+    async def start(self):
+        for _ in range(self.size):
+            self._queue.put_nowait((await self.browser.new_context(), 0))
+    
+    async def close(self):
+        while not self._queue.empty():
+            context, _ = self._queue.get_nowait()
+            if context is None:
+                continue
+            try:
+                await context.close()
+            except Exception:
+                pass
+    
+    @asynccontextmanager
+    async def acquire(self):
+        context, uses = await self._queue.get()
+        if context is None:
+            # ⭐ 지난번 교체에 실패한 빈 슬롯: 쓸 때 다시 만들어 봄 (또 실패하면 빈 슬롯 그대로 되돌려 놓음)
+            try:
+                context = await self.browser.new_context()
+            except Exception:
+                self._queue.put_nowait((None, 0))
+                raise
+        try:
+            yield context
+        finally:
+            uses += 1
+            if uses >= self.max_uses:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+                try:
+                    context, uses = await self.browser.new_context(), 0
+                except Exception:
+                    # ⭐ 닫은 컨텍스트는 절대 되돌려 놓지 않음: 빈 슬롯으로 두고 다음 acquire()에서 다시 만듦
+                    #    (다른 요청이 쓰고 있는 브라우저는 그대로 두고, 브라우저가 죽었으면 _get_pdf_pool이 재시작)
+                    context, uses = None, 0
+            self._queue.put_nowait((context, uses))
+
+
+async def _start_pdf_browser(app):
+    """Playwright + Chromium + 컨텍스트 풀 시작 (app.state에 저장)"""
+    # ⭐ playwright는 무거우므로 모듈 로드 시점이 아니라 브라우저를 띄울 때 임포트
+    from playwright.async_api import async_playwright
+    
+    app.state.playwright = await async_playwright().start()
+    app.state.browser = await app.state.playwright.chromium.launch(
+        headless=True,
+        args=PDF_BROWSER_ARGS,
+        ignore_default_args=["--enable-automation"]
+    )
+    app.state.pdf_pool = BrowserPool(app.state.browser, PDF_POOL_SIZE, PDF_CONTEXT_MAX_USES)
+    await app.state.pdf_pool.start()
+
+
+async def _stop_pdf_browser(app):
+    """컨텍스트 풀 + Chromium + Playwright 종료"""
+    pool = getattr(app.state, "pdf_pool", None)
+    browser = getattr(app.state, "browser", None)
+    playwright = getattr(app.state, "playwright", None)
+    app.state.pdf_pool = None
+    app.state.browser = None
+    app.state.playwright = None
+    if pool is not None:
+        await pool.close()
+    if browser is not None:
+        await browser.close()
+    if playwright is not None:
+        await playwright.stop()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버가 시작될 때 실행
+    app.state.pdf_pool = None
+    app.state.browser = None
+    app.state.playwright = None
+    app.state.browser_lock = asyncio.Lock()
+    try:
+        await _start_pdf_browser(app)
+    except Exception as e:
+        # 브라우저가 없어도 분석 API는 동작하도록, PDF 요청 시 다시 시도
+        logger.warning("⚠️ PDF용 브라우저 시작 실패 (PDF 요청 시 재시도): %s", e)
+    
+    yield
+    
+    # 서버가 종료될 때 실행
+    await _stop_pdf_browser(app)
+
+
+async def _get_pdf_pool(app):
+    """컨텍스트 풀 반환 (시작 실패/브라우저 비정상 종료 시 다시 띄움)"""
+    async with app.state.browser_lock:
+        browser = app.state.browser
+        if app.state.pdf_pool is None or browser is None or not browser.is_connected():
+            await _stop_pdf_browser(app)
+            await _start_pdf_browser(app)
+        return app.state.pdf_pool
+
+
+app = FastAPI(
+    title="AI 투자 포트폴리오 분석 시스템 v2",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # ⭐ 표준 json 대신 orjson으로 응답 직렬화
+)
+
+# ⭐ 1KB 넘는 응답(분석 결과 JSON, 정적 JS/CSS)은 gzip으로 압축 (SSE 스트림은 Starlette가 압축하지 않음)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+
+# ⭐ 본문을 시작 시 한 번만 gzip/br로 미리 압축해 두고 Accept-Encoding에 맞춰 골라 보냄
+class PrecompressedAsset:
+    def __init__(self, body: bytes, media_type: str, max_age: int):
+        self.body = body
+        self.media_type = media_type
+        self.etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        self.gz = gzip.compress(body, compresslevel=9)
+        self.br = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT) if brotli else None
+        self.cache_control = f"public, max-age={max_age}"
+    
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+        
+        accept_encoding = request.headers.get("accept-encoding", "")
+        content = self.body
+        if self.br is not None and "br" in accept_encoding:
+            content, headers["Content-Encoding"] = self.br, "br"
+        elif "gzip" in accept_encoding:
+            content, headers["Content-Encoding"] = self.gz, "gzip"
+        
+        return Response(content=content, media_type=self.media_type, headers=headers)
+
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE = re.compile(r"\s*([{};,>])\s*")
+
+def _minify_css(css: str) -> str:
+    """주석 제거 + 공백 압축 (calc()의 ' - '처럼 의미 있는 공백은 유지)"""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_SPACE.sub(" ", css)
+    css = _CSS_PUNCT_SPACE.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+    return css.strip()
+
+
+# ⭐ 섹터/종목/모델 목록도 정적이므로 응답 JSON을 미리 직렬화해 두고 브라우저가 잠시 재사용하도록 함
+SECTORS_JSON = orjson.dumps({"sectors": SECTORS})
+STOCKS_JSON = orjson.dumps({
+    "stocks": [{"ticker": ticker, "name": name} for ticker, name in AVAILABLE_STOCKS]
+})
+MODELS_PAYLOAD = {
+    "models": AVAILABLE_MODELS,
+    "default_model": AVAILABLE_MODELS[0] if AVAILABLE_MODELS else "No Models Available"
+}
+MODELS_JSON = orjson.dumps(MODELS_PAYLOAD)
+METADATA_HEADERS = {"Cache-Control": "public, max-age=60"}
+
+# ⭐ 종목 목록은 내용 해시를 붙인 URL로 요청하게 해서 브라우저가 하루 동안 재검증 없이 재사용
+STOCKS_VERSION = hashlib.blake2b(STOCKS_JSON, digest_size=8).hexdigest()
+VERSIONED_METADATA_HEADERS = {"Cache-Control": "public, max-age=86400, immutable"}
+
+# ⭐ 섹터/모델 목록(작음)과 종목 목록 URL은 메인 페이지에 인라인해서 첫 화면이 /api 왕복 없이 그려지도록 함
+# ('</'는 <\/로 바꿔 </script>가 JSON 안에서 스크립트 태그를 닫지 못하게 함)
+BOOTSTRAP_JSON = orjson.dumps({
+    "sectors": SECTORS,
+    **MODELS_PAYLOAD,
+    "stocks_url": f"/api/stocks?v={STOCKS_VERSION}",
+}).replace(b"</", b"<\\/")
+
+def _inline_bootstrap(page: bytes) -> bytes:
+    """index.js 스크립트 태그 바로 앞에 목록 JSON을 <script type="application/json">으로 끼워 넣음"""
+    tag = b'<script src="/static/index.js" defer></script>'
+    bootstrap = b'<script type="application/json" id="bootstrapData">' + BOOTSTRAP_JSON + b'</script>\n    '
+    return page.replace(tag, bootstrap + tag, 1)
+
+# ⭐ 메인 페이지 HTML은 프로세스 수명 동안 변하지 않으므로 시작 시 한 번만 읽어 둠
+INDEX_HTML_PATH = "experiments/templates/index.html"
+with open(INDEX_HTML_PATH, "rb") as f:
+    INDEX_HTML = PrecompressedAsset(_inline_bootstrap(f.read()), "text/html; charset=utf-8", max_age=300)
+
+# ⭐ 스타일시트도 시작 시 한 번 최소화(주석/공백 제거)한 뒤 미리 압축해 둠
+INDEX_CSS_PATH = "experiments/templates/index.css"
+with open(INDEX_CSS_PATH, encoding="utf-8") as f:
+    INDEX_CSS = PrecompressedAsset(_minify_css(f.read()).encode(), "text/css; charset=utf-8", max_age=300)
+
+@app.get("/static/index.css", include_in_schema=False)
+async def index_css(request: Request):
+    """최소화 + 미리 압축한 스타일시트 (/static 마운트보다 먼저 등록해야 우선 매칭됨)"""
+    return INDEX_CSS.response(request)
+
+# 정적 파일 (JS 등) 서빙 설정
 app.mount("/static", StaticFiles(directory="experiments/templates"), name="static")
 
 
+
 # =====================================================
 # Request Model
 # =====================================================
 
+# ⭐ 요청 모델은 검증 후 바꾸지 않으므로 frozen, 정의되지 않은 필드는 거부
+REQUEST_MODEL_CONFIG = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
 class InvestmentTargets(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     sectors: List[str] = Field(default=[], description="선택한 섹터 리스트")
     tickers: List[str] = Field(default=[], description="선택한 종목 티커 리스트")
 
 class PortfolioRequest(BaseModel):
-    budget: int = Field(..., ge=1000000, description="투자 예산")
+    model_config = REQUEST_MODEL_CONFIG
+    
+    budget: int = Field(..., ge=1_000_000, le=100_000_000_000, description="투자 예산 (100만원 ~ 1000억원)")
     investment_targets: InvestmentTargets = Field(..., description="투자 대상 (섹터/종목)")
     risk_profile: Literal["안정", "중립", "공격"] = Field(..., description="투자 성향")
     investment_period: Literal["단기", "중기", "장기"] = Field(..., description="투자 기간")
@@ -52,9 +344,10 @@ class PortfolioRequest(BaseModel):
 # API Endpoints
 # =====================================================
 
-@app.get("/", response_class=FileResponse)
-async def index():
-    return FileResponse("experiments/templates/index.html")
+@app.get("/", response_class=HTMLResponse)
+async def index(request: Request):
+    """메인 페이지 (미리 압축해 둔 바이트 + ETag 재검증)"""
+    return INDEX_HTML.response(request)
 
 @app.get("/test-multi-agent", response_class=FileResponse)
 async def test_multi_agent():
@@ -64,31 +357,35 @@ async def test_multi_agent():
 @app.get("/api/sectors")
 async def get_sectors():
     """사용 가능한 섹터 리스트"""
-    return {"sectors": SECTORS}
+    return Response(content=SECTORS_JSON, media_type="application/json", headers=METADATA_HEADERS)
 
 @app.get("/api/stocks")
-async def get_stocks():
-    """전체 종목 리스트"""
-    return {
-        "stocks": [
-            {"ticker": ticker, "name": name}
-            for ticker, name in AVAILABLE_STOCKS
-        ]
-    }
+async def get_stocks(v: Optional[str] = None):
+    """전체 종목 리스트 (현재 버전 해시로 요청하면 장기 캐시)"""
+    headers = VERSIONED_METADATA_HEADERS if v == STOCKS_VERSION else METADATA_HEADERS
+    return Response(content=STOCKS_JSON, media_type="application/json", headers=headers)
 
 @app.get("/api/models")
 async def get_available_models():
     """사용 가능한 AI 모델 리스트"""
-    return {
-        "models": AVAILABLE_MODELS,
-        "default_model": AVAILABLE_MODELS[0] if AVAILABLE_MODELS else "No Models Available"
-    }
+    return Response(content=MODELS_JSON, media_type="application/json", headers=METADATA_HEADERS)
 
 
 # =====================================================
 # 공통 파싱 함수
 # =====================================================
 
+_JSON_DECODER = json.JSONDecoder()
+
+# ⭐ orjson은 비문자열 키·numpy 값을 기본으로 거부하므로 옵션으로 허용
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _dumps(obj):
+    """orjson으로 직렬화해 문자열로 반환 (json.dumps(ensure_ascii=False)와 같은 결과)"""
+    return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+
+
 def parse_agent_result(result, engine="anthropic"):
     """Anthropic과 LangGraph 결과를 통합 처리하는 파싱 함수
     
@@ -112,34 +409,26 @@ def parse_agent_result(result, engine="anthropic"):
     # 2. Anthropic 방식 (문자열 파싱 필요)
     report_text = result.get("final_report", "") if isinstance(result, dict) else str(result)
     
-    if not report_text:
-        return _get_default_data()
-    
-    data = None
-    
-    # 2-1: ```json 블록 찾기
-    json_match = re.search(r'```json\s*([\s\S]*?)\s*```', report_text)
-    if json_match:
-        json_str = json_match.group(1).strip()
+    # ⭐ 정규식 대신 앞에서부터 한 번만 훑어 JSON 위치를 찾음 (JSON이 없으면 예외 없이 바로 기본값)
+    brace = report_text.find("{")
+    if brace >= 0:
+        # 2-1: ```json 블록이 있으면 블록 안만 파싱
+        start = report_text.find("```json")
+        if start >= 0:
+            end = report_text.find("```", start + 7)
+            try:
+                return orjson.loads(report_text[start + 7:end] if end >= 0 else report_text[start + 7:])
+            except orjson.JSONDecodeError:
+                pass
+        
+        # 2-2: 첫 '{'부터 JSON 객체 하나만 디코딩 (앞뒤에 붙은 설명 문장은 무시)
         try:
-            data = json.loads(json_str)
+            data, _ = _JSON_DECODER.raw_decode(report_text, brace)
             return data
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError:
             pass
     
-    # 2-2: 직접 JSON 파싱 시도
-    try:
-        data = json.loads(report_text)
-        return data
-    except json.JSONDecodeError as e:
-        pass
-    
-    # 3. 실패 시 기본값
-    return _get_default_data()
-
-
-def _get_default_data():
-    """파싱 실패 시 기본 데이터 반환"""
+    # 3. 실패 시 기본값 (호출 측에서 차트 데이터를 덧붙이므로 매번 새 dict)
     return {
         "ai_summary": "분석 결과를 불러올 수 없습니다.",
         "portfolio_allocation": [],
@@ -152,26 +441,39 @@ def _get_default_data():
 # 분석 엔드포인트
 # =====================================================
 
+# ⭐ 같은 조건으로 다시 분석하면(재분석 클릭/다른 탭) 에이전트를 다시 돌리지 않고 최근 결과 재사용
+ANALYZE_CACHE = TTLCache(
+    maxsize=int(os.getenv("ANALYZE_CACHE_SIZE", "256")),
+    ttl=int(os.getenv("ANALYZE_CACHE_TTL", "900"))
+)
+
+
+def _analyze_cache_key(engine, request):
+    """엔진 + 요청 본문(키 정렬)으로 캐시 키 생성"""
+    body = orjson.dumps(request.model_dump(), option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(engine.encode() + b":" + body, digest_size=16).digest()
+
+
 @app.post("/api/analyze/anthropic")
 async def analyze_anthropic(request: PortfolioRequest):
     """Anthropic 엔진으로 포트폴리오 분석"""
     try:
-        print(f"\n{'='*60}")
-        print(f"🌟 Anthropic 분석 요청")
-        print(f"  예산: {request.budget:,}원")
-        print(f"  섹터: {request.investment_targets.sectors}")
-        print(f"  종목: {request.investment_targets.tickers}")
-        print(f"  성향: {request.risk_profile}")
-        print(f"  기간: {request.investment_period}")
-        print(f"  모델: {request.model_name}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "🌟 Anthropic 분석 요청 - 예산: %s원, 섹터: %s, 종목: %s, 성향: %s, 기간: %s, 모델: %s",
+            request.budget, request.investment_targets.sectors, request.investment_targets.tickers,
+            request.risk_profile, request.investment_period, request.model_name
+        )
+        
+        cache_key = _analyze_cache_key("anthropic", request)
+        cached = ANALYZE_CACHE.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(content=cached)
         
-        result = run_portfolio_agent(
+        # ⭐ 동기 에이전트 호출(수 초~수십 초)은 스레드로 넘겨 이벤트 루프가 다른 요청을 처리하도록 함
+        result = await asyncio.to_thread(
+            run_portfolio_agent,
             budget=request.budget,
-            investment_targets={
-                "sectors": request.investment_targets.sectors,
-                "tickers": request.investment_targets.tickers
-            },
+            investment_targets=request.investment_targets.model_dump(),
             risk_profile=request.risk_profile,
             investment_period=request.investment_period,
             model_name=request.model_name,
@@ -179,22 +481,21 @@ async def analyze_anthropic(request: PortfolioRequest):
         )
         
         if result["success"]:
-            # 공통 파싱 함수 사용
-            data = parse_agent_result(result, engine="anthropic")
-            
-            # 차트 생성 및 데이터 추가
-            data = _add_chart_data(data)
+            # 공통 파싱 + 차트 데이터 생성 (CPU 작업이라 스레드에서 실행해 다른 요청의 LLM 대기와 겹치게 함)
+            data = await asyncio.to_thread(_build_report, result, "anthropic")
             
-            return JSONResponse(content={
+            content = {
                 "success": True,
-                "report": json.dumps(data, ensure_ascii=False),
+                "report": data,  # ⭐ 문자열로 한 번 더 직렬화하지 않고 객체 그대로 전달
                 "iterations": result.get("iterations", 1)
-            })
+            }
+            ANALYZE_CACHE.put(cache_key, content)
+            return ORJSONResponse(content=content)
         else:
             raise HTTPException(status_code=500, detail=result.get("error", "알 수 없는 오류"))
     
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("분석 오류")
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
 
@@ -202,21 +503,21 @@ async def analyze_anthropic(request: PortfolioRequest):
 async def analyze_langgraph(request: PortfolioRequest):
     """멀티 에이전트로 포트폴리오 분석 (LangGraph 엔드포인트 대체)"""
     try:
-        print(f"\n{'='*60}")
-        print(f"🤖 멀티 에이전트 분석 요청 (LangGraph 엔드포인트)")
-        print(f"  예산: {request.budget:,}원")
-        print(f"  섹터: {request.investment_targets.sectors}")
-        print(f"  종목: {request.investment_targets.tickers}")
-        print(f"  성향: {request.risk_profile}")
-        print(f"  기간: {request.investment_period}")
-        print(f"{'='*60}\n")
+        logger.debug(
+            "🤖 멀티 에이전트 분석 요청 (LangGraph 엔드포인트) - 예산: %s원, 섹터: %s, 종목: %s, 성향: %s, 기간: %s",
+            request.budget, request.investment_targets.sectors, request.investment_targets.tickers,
+            request.risk_profile, request.investment_period
+        )
         
-        result = run_multi_agent_portfolio(
+        cache_key = _analyze_cache_key("langgraph", request)
+        cached = ANALYZE_CACHE.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(content=cached)
+        
+        # ⭐ 멀티 에이전트는 비동기 그래프이므로 스레드 없이 바로 await
+        result = await arun_multi_agent_portfolio(
             budget=request.budget,
-            investment_targets={
-                "sectors": request.investment_targets.sectors,
-                "tickers": request.investment_targets.tickers
-            },
+            investment_targets=request.investment_targets.model_dump(),
             risk_profile=request.risk_profile,
             investment_period=request.investment_period,
             additional_prompt=request.additional_prompt,
@@ -224,203 +525,245 @@ async def analyze_langgraph(request: PortfolioRequest):
         )
         
         if result["success"]:
-            # 공통 파싱 함수 사용
-            data = parse_agent_result(result, engine="langgraph")
-            
-            # 차트 생성 및 데이터 추가
-            data = _add_chart_data(data)
+            # 공통 파싱 + 차트 데이터 생성
+            data = await asyncio.to_thread(_build_report, result, "langgraph")
             
-            return JSONResponse(content={
-                "success": True,
-                "report": json.dumps(data, ensure_ascii=False),
-                "iterations": 1
-            })
+            content = {"success": True, "report": data, "iterations": 1}
+            ANALYZE_CACHE.put(cache_key, content)
+            return ORJSONResponse(content=content)
         else:
             raise HTTPException(status_code=500, detail=result.get("error", "알 수 없는 오류"))
     
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("분석 오류")
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
 
-def _add_chart_data(data):
-    """차트 HTML 및 설정 추가하는 공통 함수"""
-    # Sunburst 차트 생성
-    sunburst_chart, chart_config = create_sunburst_chart(data)
-    
-    # 차트를 HTML로 변환
-    chart_html = to_html(
-        sunburst_chart, 
-        include_plotlyjs='cdn',
-        full_html=False,
-        div_id="sectorChart"
+# ⭐ 전문가 노드별로 요약을 꺼낼 상태 키
+_EXPERT_ANALYSIS_KEYS = {
+    "financial_agent": "financial_analysis",
+    "technical_agent": "technical_analysis",
+    "news_agent": "news_analysis",
+}
+
+
+def _sse_event(payload):
+    """Server-Sent Events 한 건을 직렬화"""
+    return f"data: {_dumps(payload)}\n\n"
+
+
+def _stage_payload(stage, update):
+    """단계별로 클라이언트에 보낼 가벼운 정보만 추출 (전체 상태는 보내지 않음)"""
+    if stage == "initialization":
+        return {"stock_count": len(update.get("company_infos", {}))}
+    if stage in _EXPERT_ANALYSIS_KEYS:
+        analysis = update.get(_EXPERT_ANALYSIS_KEYS[stage], {})
+        return {"summary": analysis.get("analysis_summary")}
+    if stage == "supervisor":
+        # ⭐ 최종 요약은 검증/차트 생성 전에 먼저 보내 화면에 바로 표시
+        return {
+            "ai_summary": update.get("ai_summary"),
+            "stock_count": len(update.get("portfolio_allocation") or [])
+        }
+    return {}
+
+
+@app.post("/api/analyze/langgraph/stream")
+async def analyze_langgraph_stream(request: PortfolioRequest):
+    """멀티 에이전트 분석을 SSE로 스트리밍 (단계가 끝날 때마다 이벤트 전송)"""
+    logger.debug(
+        "🤖 멀티 에이전트 분석 요청 (SSE 스트리밍) - 예산: %s원, 섹터: %s, 종목: %s",
+        request.budget, request.investment_targets.sectors, request.investment_targets.tickers
     )
     
-    # chart_data 구조 생성 (수익률 차트용)
-    chart_data = {}
+    # 스트리밍도 /api/analyze/langgraph와 같은 결과이므로 캐시를 공유
+    cache_key = _analyze_cache_key("langgraph", request)
     
-    # 기존 데이터에서 수익률 정보 추출
-    if (data.get('chart_data', {}).get('expected_performance') and 
-        'months' in data['chart_data']['expected_performance'] and
-        'portfolio' in data['chart_data']['expected_performance'] and
-        'benchmark' in data['chart_data']['expected_performance']):
+    async def event_generator():
+        cached = ANALYZE_CACHE.get(cache_key)
+        if cached is not None:
+            yield _sse_event({"stage": "result", **cached})
+            return
         
-        existing_perf = data['chart_data']['expected_performance']
-        chart_data['expected_performance'] = {
-            'months': existing_perf['months'],
-            'portfolio': existing_perf['portfolio'], 
-            'benchmark': existing_perf['benchmark']
-        }
-        
-    elif 'months' in data and 'portfolio' in data and 'benchmark' in data:
-        chart_data['expected_performance'] = {
-            'months': data['months'],
-            'portfolio': data['portfolio'], 
-            'benchmark': data['benchmark']
-        }
-    else:
-        chart_data['expected_performance'] = None
+        try:
+            async for stage, update in astream_multi_agent_portfolio(
+                budget=request.budget,
+                investment_targets=request.investment_targets.model_dump(),
+                risk_profile=request.risk_profile,
+                investment_period=request.investment_period,
+                additional_prompt=request.additional_prompt,
+                model_name=request.model_name
+            ):
+                if stage != "result":
+                    yield _sse_event({"stage": stage, "payload": _stage_payload(stage, update)})
+                    continue
+                
+                data = await asyncio.to_thread(_build_report, update, "langgraph")
+                content = {"success": True, "report": data, "iterations": 1}
+                ANALYZE_CACHE.put(cache_key, content)
+                yield _sse_event({"stage": "result", **content})
+        except Exception as e:
+            logger.exception("분석 오류")
+            yield _sse_event({"stage": "error", "detail": f"서버 오류: {str(e)}"})
+    
+    # ⭐ 비동기 제너레이터라 LLM 응답을 기다리는 동안 이벤트 루프를 막지 않음
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+_SCORE_KEYS = ('data_analysis', 'financial', 'news')
+
+
+def _prepare_allocation(portfolio):
+    """종목별 평균 점수(avg_score)를 미리 계산하고 비중 내림차순으로 정렬해 두는 함수 (클라이언트는 그대로 표시)"""
+    if not portfolio:
+        return
+    portfolio.sort(key=lambda stock: stock.get('weight') or 0, reverse=True)
+    
+    for stock in portfolio:
+        scores = stock.get('scores')
+        if not isinstance(scores, dict) or 'avg_score' in stock:
+            continue
+        # ⭐ 점수는 LLM JSON 그대로라 null/문자열이 섞일 수 있음: 없거나 null이면 0, 숫자로 못 바꾸면 평균 생략
+        try:
+            total = sum(float(scores.get(key) or 0) for key in _SCORE_KEYS)
+        except (TypeError, ValueError):
+            continue
+        stock['avg_score'] = round(total / len(_SCORE_KEYS))
+
+
+_PERFORMANCE_KEYS = ('months', 'portfolio', 'benchmark')
+
+
+def _finalize_chart_data(data):
+    """data['chart_data']를 제자리에서 정리 (expected_performance / sunburst 키 보장)"""
+    chart_data = data.get('chart_data')
+    if not isinstance(chart_data, dict):
+        chart_data = data['chart_data'] = {}
+    
+    # 수익률 차트 데이터: chart_data 안 → 최상위 필드 순으로 찾고 없으면 None
+    perf = chart_data.get('expected_performance')
+    if not (perf and all(key in perf for key in _PERFORMANCE_KEYS)):
+        if all(key in data for key in _PERFORMANCE_KEYS):
+            perf = {key: data[key] for key in _PERFORMANCE_KEYS}
+        else:
+            perf = None
+    chart_data['expected_performance'] = perf
+    chart_data.setdefault('sunburst', None)
+    return chart_data
+
+
+def _add_chart_data(data):
+    """차트 설정(chart_config) 및 수익률 데이터 추가하는 공통 함수"""
+    # ⭐ 결과 표에 쓰는 평균 점수/비중순 정렬도 여기서 함께 처리
+    _prepare_allocation(data.get('portfolio_allocation'))
+    
+    # Sunburst 차트 설정 생성
+    # ⭐ 클라이언트는 chart_config(순수 데이터)로 Plotly를 직접 그리므로 서버에서는 Figure를 만들지 않음
+    chart_config = create_sunburst_chart(data)
+    
+    # ⭐ chart_data는 새 dict로 다시 만들지 않고 제자리에서 정리 (LLM이 준 sunburst 등 다른 키 보존)
+    _finalize_chart_data(data)
     
     # 데이터에 차트 추가
-    data['chart_html'] = chart_html
     data['chart_config'] = chart_config
-    data['chart_data'] = chart_data
     
     return data
 
+
+def _build_report(result, engine):
+    """에이전트 결과 → 응답용 report (파싱 + 차트 데이터 추가)"""
+    return _add_chart_data(parse_agent_result(result, engine=engine))
+
+# 섹터별 색상 (Sunburst 차트)
+SECTOR_COLOR_MAP = {
+    '반도체': '#4A5FC1',
+    '바이오': '#5C3D7C',
+    '방산': '#C94E8C',
+    '통신': '#2A7FBA',
+    '원자력': '#2D8F5C',
+    '전력망': '#D63D5C',
+    '조선': '#DAA520',
+    'AI': '#FF6B9D',
+    '기타': '#1B8B8B'
+}
+DEFAULT_SECTOR_COLOR = '#1B8B8B'
+
+
+def _hex_to_rgb(hex_color):
+    return int(hex_color[1:3], 16), int(hex_color[3:5], 16), int(hex_color[5:7], 16)
+
+
+# ⭐ hex 색상은 모듈 로드 시 한 번만 (r, g, b)로 파싱
+_SECTOR_RGB = {sector: _hex_to_rgb(color) for sector, color in SECTOR_COLOR_MAP.items()}
+_DEFAULT_SECTOR_RGB = _hex_to_rgb(DEFAULT_SECTOR_COLOR)
+
+
+def _lighten_shades(rgb, count):
+    """밝기 조정 함수 (종목 순서가 뒤일수록 15%씩 밝게) - 섹터 종목 수만큼 한 번에 계산"""
+    shades = []
+    for i in range(count):
+        factor = 1 + (i * 0.15)
+        r, g, b = (min(255, int(c * factor)) for c in rgb)
+        shades.append(f"rgb({r},{g},{b})")
+    return shades
+
+
+# ⭐ 섹터별 종목 색상표를 미리 만들어 두고 차트 생성 시에는 잘라 쓰기만 함
+#    (한 섹터 종목이 이보다 많을 때만 그 자리에서 계산)
+_PRECOMPUTED_SHADES = 10
+SECTOR_SHADES = {sector: _lighten_shades(rgb, _PRECOMPUTED_SHADES) for sector, rgb in _SECTOR_RGB.items()}
+DEFAULT_SECTOR_SHADES = _lighten_shades(_DEFAULT_SECTOR_RGB, _PRECOMPUTED_SHADES)
+
+
+def _sector_shades(sector, count):
+    """섹터 종목 수만큼의 색상 목록 반환"""
+    if count <= _PRECOMPUTED_SHADES:
+        return SECTOR_SHADES.get(sector, DEFAULT_SECTOR_SHADES)[:count]
+    return _lighten_shades(_SECTOR_RGB.get(sector, _DEFAULT_SECTOR_RGB), count)
+
+
 def create_sunburst_chart(data):
-    """3단계 구조의 완전한 원형 Sunburst 차트 생성"""
-    
+    """3단계 구조의 완전한 원형 Sunburst 차트 설정(chart_config) 생성"""
     portfolio = data.get('portfolio_allocation', [])
     
     if not portfolio:
-        # 빈 차트 반환
-        fig_sunburst = go.Figure()
-        fig_sunburst.add_trace(go.Sunburst(
-            labels=['데이터 없음'],
-            parents=[''],
-            values=[100],
-            marker=dict(colors=['#cccccc'])
-        ))
-        return fig_sunburst, {}
-    
-    # 색상 매핑
-    colorMap = {
-        '반도체': '#4A5FC1',
-        '바이오': '#5C3D7C',
-        '방산': '#C94E8C',
-        '통신': '#2A7FBA',
-        '원자력': '#2D8F5C',
-        '전력망': '#D63D5C',
-        '조선': '#DAA520',
-        'AI': '#FF6B9D',
-        '기타': '#1B8B8B'
-    }
-    
-    def lighten_color(hex_color, brightness_level=0):
-        """밝기 조정 함수"""
-        if hex_color.startswith('rgb'):
-            return hex_color
-            
-        r = int(hex_color[1:3], 16)
-        g = int(hex_color[3:5], 16)
-        b = int(hex_color[5:7], 16)
-        
-        factor = 1 + (brightness_level * 0.15)
-        r = min(255, int(r * factor))
-        g = min(255, int(g * factor))
-        b = min(255, int(b * factor))
-        
-        return f"rgb({r},{g},{b})"
-    
-    # 데이터 구조 생성
-    labels = []
-    parents = []
-    values = []
-    colors = []
+        return {}
     
-    # 섹터별 그룹화
-    sector_map = {}
+    # === 3단계 구조: 포트폴리오 → 섹터 → 종목 ===
+    # ⭐ 포트폴리오를 한 번만 돌며 섹터별 종목/비중과 섹터·전체 합계를 함께 누적
+    sector_stocks = defaultdict(list)
+    sector_weights = defaultdict(float)
+    total_weight = 0.0
     for stock in portfolio:
+        weight = stock.get('weight', 0) * 100
         sector = stock.get('sector', '기타')
-        if sector not in sector_map:
-            sector_map[sector] = []
-        sector_map[sector].append(stock)
-    
-    # === 3단계 구조: 포트폴리오 → 섹터 → 종목 ===
+        sector_stocks[sector].append((stock, weight))
+        sector_weights[sector] += weight
+        total_weight += weight
     
-    # 1. 루트 노드 "포트폴리오" 추가
-    total_portfolio_value = sum((stock.get('weight', 0) * 100) for stock in portfolio)
-    labels.append('포트폴리오')
-    parents.append('')  # 최상위 루트
-    values.append(total_portfolio_value)
-    colors.append('#FFFFFF')  # 포트폴리오 색상 (흰색)
+    # 1. 루트 노드 "포트폴리오"
+    labels = ['포트폴리오']
+    parents = ['']  # 최상위 루트
+    values = [total_weight]
+    colors = ['#FFFFFF']  # 포트폴리오 색상 (흰색)
     
-    # 2. 섹터들 추가 (부모: 포트폴리오)
-    for sector, stocks in sector_map.items():
+    # 2. 섹터(부모: 포트폴리오) 바로 뒤에 그 종목들(부모: 섹터)을 이어서 추가
+    for sector, stocks in sector_stocks.items():
         labels.append(sector)
-        parents.append('포트폴리오')  # 부모는 포트폴리오
+        parents.append('포트폴리오')
+        values.append(sector_weights[sector])
+        colors.append(SECTOR_COLOR_MAP.get(sector, DEFAULT_SECTOR_COLOR))
         
-        # 섹터의 총 비중 계산
-        sector_total = sum((stock.get('weight', 0) * 100) for stock in stocks)
-        values.append(sector_total)
-        colors.append(colorMap.get(sector, '#1B8B8B'))
-    
-    # 3. 종목들 추가 (부모: 각 섹터)
-    sector_stock_index = {}
-    for sector, stocks in sector_map.items():
-        if sector not in sector_stock_index:
-            sector_stock_index[sector] = 0
-        
-        for stock in stocks:
-            stock_name = stock.get('name') or stock.get('ticker', '미정')
-            stock_weight = (stock.get('weight', 0) * 100)
-            
-            labels.append(stock_name)
-            parents.append(sector)  # 부모는 섹터
-            values.append(stock_weight)
-            
-            # 밝은 색상 적용
-            brightness = sector_stock_index[sector]
-            sector_stock_index[sector] += 1
-            base_color = colorMap.get(sector, '#1B8B8B')
-            lighter_color = lighten_color(base_color, brightness)
-            colors.append(lighter_color)
-    
-    # go.Sunburst로 차트 생성
-    fig_sunburst = go.Figure(go.Sunburst(
-        labels=labels,
-        parents=parents,
-        values=values,
-        branchvalues='total',  # 🔥 완전한 원형을 위해 'total' 사용
-        marker=dict(
-            colors=colors,
-            line=dict(color='white', width=2)
-        ),
-        textfont=dict(size=12, color='white', family='Pretendard, Arial, sans-serif'),  # ⭐ 흰색
-        textinfo='label',  # ⭐ 라벨만 표시
-        hovertemplate='<b>%{label}</b><br>비중: %{value:.1f}%<extra></extra>',
-        maxdepth=3,  # 3단계 모두 표시
-        rotation=0,   # 회전 고정
-        sort=False    # 정렬 비활성화
-    ))
-    
-    # 레이아웃 설정
-    fig_sunburst.update_layout(
-        font=dict(
-            family="Pretendard, -apple-system, BlinkMacSystemFont, system-ui, Arial, sans-serif",
-            size=16,
-            color='white'
-        ),
-        margin=dict(l=20, r=20, t=20, b=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        autosize=True,
-        width=None,
-        height=400  # ⭐ 390 → 400으로 10px 증가
-    )
+        labels.extend(stock.get('name') or stock.get('ticker', '미정') for stock, _ in stocks)
+        parents.extend([sector] * len(stocks))
+        values.extend(weight for _, weight in stocks)
+        colors.extend(_sector_shades(sector, len(stocks)))  # 종목 순서대로 밝게
     
-    # 차트 설정을 JSON으로도 반환
+    # ⭐ 클라이언트가 Plotly로 직접 그리는 차트 설정 (순수 list/dict만, 서버에서는 Figure를 만들지 않음)
     chart_config = {
         'labels': labels,
         'parents': parents,
@@ -437,142 +780,155 @@ def create_sunburst_chart(data):
         }
     }
     
-    return fig_sunburst, chart_config
+    return chart_config
+
+
+# ⭐ 한글 폰트 및 차트 표시용 CSS (요청마다 같으므로 모듈 상수로 한 번만 생성)
+PDF_FONT_CSS = """
+<style>
+    @import url('https://cdn.jsdelivr.net/gh/orioncactus/pretendard/dist/web/static/pretendard.css');
+    * {
+        font-family: 'Malgun Gothic', '맑은 고딕', Pretendard, sans-serif !important;
+    }
+    /* ⭐ 차트는 브라우저에서 이미 그려진 Plotly SVG 그대로 출력 (Plotly.js 없이,
+          Plotly 전역 스타일은 프론트엔드가 결과 HTML 앞에 <style>로 붙여 보냄) */
+    /* PDF용 최적화 */
+    @media print {
+        .btn-primary { display: none !important; }
+        #downloadPdfBtn { display: none !important; }
+        .chart-container { 
+            height: 350px !important;  /* ⭐ PDF용 높이 증가 (300 → 350) */
+            margin: 20px 0 !important;  /* ⭐ 상하 여백 증가 */
+            page-break-inside: avoid;  /* ⭐ 페이지 분할 방지 */
+            overflow: visible;
+        }
+        .section {
+            page-break-inside: avoid;  /* ⭐ 섹션 분할 방지 */
+            margin-bottom: 30px !important;  /* ⭐ 섹션 간 여백 증가 */
+        }
+        #sectorChart, #performanceChart {
+            height: 320px !important;  /* ⭐ 실제 차트 높이 증가 (280 → 320) */
+            width: 100% !important;
+        }
+        /* Plotly.js PDF 호환성 개선 */
+        .plotly-graph-div {
+            height: 320px !important;  /* ⭐ Plotly div 높이 증가 (280 → 320) */
+            page-break-inside: avoid;
+        }
+        /* 폰트 크기 조정 */
+        .plotly-graph-div text {
+            font-size: 11px !important;  /* ⭐ 폰트 크기 감소 */
+            font-family: 'Malgun Gothic', Arial, sans-serif !important;
+        }
+        /* 투자 책임 경고 - PDF용 */
+        .disclaimer {
+            background: #fff3cd !important;
+            border: 2px solid #ffc107 !important;
+            border-radius: 8px !important;
+            padding: 15px !important;
+            margin-top: 30px !important;
+            page-break-inside: avoid !important;
+        }
+        .disclaimer p {
+            font-size: 10px !important;
+            line-height: 1.5 !important;
+            color: #333 !important;
+        }
+    }
+</style>
+"""
+
 
 @app.post("/api/download-pdf")
-async def download_pdf(request: dict):
+async def download_pdf(request: Request):
     """Playwright를 사용한 PDF 다운로드 (JavaScript 실행 지원)"""
     try:
+        # ⭐ 클라이언트가 CompressionStream으로 gzip 압축한 본문을 보내면 풀어서 사용
+        body = await request.body()
+        if request.headers.get("content-encoding", "").lower() == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError):
+                raise HTTPException(status_code=400, detail="압축된 요청 본문을 해제할 수 없습니다")
+        
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="잘못된 요청 형식입니다")
+        
         # 요청 데이터 검증
-        html_content = request.get("html")
+        html_content = payload.get("html") if isinstance(payload, dict) else None
         if not html_content:
             raise HTTPException(status_code=400, detail="HTML 데이터가 없습니다")
         
-        # ⭐ 한글 폰트 및 차트 표시용 CSS 추가
-        font_css = """
-        <style>
-            @import url('https://cdn.jsdelivr.net/gh/orioncactus/pretendard/dist/web/static/pretendard.css');
-            * {
-                font-family: 'Malgun Gothic', '맑은 고딕', Pretendard, sans-serif !important;
-            }
-            /* PDF용 최적화 */
-            @media print {
-                .btn-primary { display: none !important; }
-                #downloadPdfBtn { display: none !important; }
-                .chart-container { 
-                    height: 350px !important;  /* ⭐ PDF용 높이 증가 (300 → 350) */
-                    margin: 20px 0 !important;  /* ⭐ 상하 여백 증가 */
-                    page-break-inside: avoid;  /* ⭐ 페이지 분할 방지 */
-                    overflow: visible;
-                }
-                .section {
-                    page-break-inside: avoid;  /* ⭐ 섹션 분할 방지 */
-                    margin-bottom: 30px !important;  /* ⭐ 섹션 간 여백 증가 */
-                }
-                #sectorChart, #performanceChart {
-                    height: 320px !important;  /* ⭐ 실제 차트 높이 증가 (280 → 320) */
-                    width: 100% !important;
-                }
-                /* Plotly.js PDF 호환성 개선 */
-                .plotly-graph-div {
-                    height: 320px !important;  /* ⭐ Plotly div 높이 증가 (280 → 320) */
-                    page-break-inside: avoid;
-                }
-                /* 폰트 크기 조정 */
-                .plotly-graph-div text {
-                    font-size: 11px !important;  /* ⭐ 폰트 크기 감소 */
-                    font-family: 'Malgun Gothic', Arial, sans-serif !important;
-                }
-                /* 투자 책임 경고 - PDF용 */
-                .disclaimer {
-                    background: #fff3cd !important;
-                    border: 2px solid #ffc107 !important;
-                    border-radius: 8px !important;
-                    padding: 15px !important;
-                    margin-top: 30px !important;
-                    page-break-inside: avoid !important;
-                }
-                .disclaimer p {
-                    font-size: 10px !important;
-                    line-height: 1.5 !important;
-                    color: #333 !important;
-                }
-            }
-        </style>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        """
+        # ⭐ 캐시 키는 생성일시가 빠진 결과 HTML로 만들고, 생성일시(%DATE% 자리)는 조회 뒤에 채움
+        #    (같은 결과를 다시 받으면 처음 만든 PDF를 그대로 돌려줌)
+        cache_key = hashlib.blake2b(html_content.encode("utf-8"), digest_size=16).digest()
+        pdf_bytes = PDF_CACHE.get(cache_key)
         
-        # HTML head에 폰트 CSS 추가
-        html_with_font = html_content.replace('<head>', '<head>' + font_css)
+        generated_at = payload.get("now") or time.strftime("%Y. %m. %d. %H:%M:%S")
+        html_content = html_content.replace("%DATE%", html.escape(str(generated_at)), 1)
         
-        # ⭐ Playwright로 PDF 생성 (동기식으로 변경)
-        def generate_pdf():
-            with sync_playwright() as playwright:
-                browser = playwright.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                # HTML 콘텐츠 설정
-                page.set_content(html_with_font)
-                
-                # JavaScript 실행 완료까지 대기 (차트 렌더링 포함)
-                page.wait_for_load_state('networkidle')
-                page.wait_for_timeout(3000)  # 기본 대기
-                
-                # Plotly 라이브러리 로드 확인
-                try:
-                    page.evaluate("typeof Plotly !== 'undefined'")
-                except:
-                    page.wait_for_timeout(2000)
-                
-                # 차트 요소 존재 확인 (JavaScript 오류 방지)
+        # HTML head에 폰트 CSS 추가 (첫 <head> 바로 뒤에 한 번만 삽입)
+        pre, sep, post = html_content.partition('<head>')
+        html_with_font = pre + sep + PDF_FONT_CSS + post if sep else PDF_FONT_CSS + html_content
+        
+        # 페이지 하나에 HTML을 올려 PDF로 출력
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        async def render_pdf(page):
+            # ⭐ 차트는 스냅샷에 SVG로 들어 있으므로 모든 하위 리소스(load)까지 기다리지 않고 DOM 준비 시점에 진행
+            await page.set_content(html_with_font, wait_until="domcontentloaded", timeout=20000)
+            
+            # 웹폰트만 잠깐 기다림 (폰트 CDN이 느리면 대체 폰트로 출력)
+            try:
+                await page.wait_for_function("document.fonts.status === 'loaded'", timeout=PDF_FONT_WAIT_MS)
+            except PlaywrightTimeoutError:
+                pass
+            
+            # PDF 생성
+            pdf_bytes = await page.pdf(
+                format='A4',
+                landscape=False,  # 세로 방향
+                margin={
+                    'top': '15mm',
+                    'right': '15mm',
+                    'bottom': '15mm',
+                    'left': '15mm'
+                },
+                print_background=True,  # 배경색/이미지 포함 (배지·면책 박스·표 머리글 색이 배경으로 들어 있음)
+                prefer_css_page_size=False  # ⭐ @page 규칙이 없으므로 format 값을 그대로 사용
+            )
+            
+            return pdf_bytes
+        
+        # ⭐ 컨텍스트 풀에서 하나를 빌려 새 페이지로 PDF 생성 (브라우저 기동 비용 없음, 동시 렌더링 수 제한)
+        async def generate_pdf():
+            pool = await _get_pdf_pool(app)
+            async with pool.acquire() as context:
+                page = await context.new_page()
                 try:
-                    page.evaluate("""
-                        () => {
-                            const sectorChart = document.getElementById('sectorChart');
-                            const performanceChart = document.getElementById('performanceChart');
-                            if (!sectorChart || !performanceChart) {
-                                throw new Error('차트 요소를 찾을 수 없습니다');
-                            }
-                            return true;
-                        }
-                    """)
-                except Exception as e:
-                    # 차트가 없어도 PDF 생성 계속 진행
-                    pass
-                
-                # PDF 생성
-                pdf_bytes = page.pdf(
-                    format='A4',
-                    landscape=False,  # 세로 방향
-                    margin={
-                        'top': '15mm',
-                        'right': '15mm',
-                        'bottom': '15mm',
-                        'left': '15mm'
-                    },
-                    print_background=True,  # 배경색/이미지 포함
-                    prefer_css_page_size=True
-                )
-                
-                browser.close()
-                return pdf_bytes
+                    # ⭐ 렌더링 전체에 상한을 둬서 멈춘 페이지가 풀의 컨텍스트를 계속 붙잡지 않도록 함
+                    return await asyncio.wait_for(render_pdf(page), PDF_RENDER_TIMEOUT_S)
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail="PDF 생성 시간이 초과되었습니다")
+                finally:
+                    await page.close()
         
-        # 동기 함수를 별도 스레드에서 실행
-        import asyncio
-        import concurrent.futures
+        if pdf_bytes is None:
+            pdf_bytes = await generate_pdf()
+            PDF_CACHE.put(cache_key, pdf_bytes)
         
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            pdf_bytes = await asyncio.get_event_loop().run_in_executor(executor, generate_pdf)
         # 파일명 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"portfolio_analysis_{timestamp}.pdf"
+        filename = f"portfolio_analysis_{time.strftime('%Y%m%d_%H%M%S')}_{next(_PDF_SEQ)}.pdf"
         
         # 응답 생성
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+        # ⭐ PDF는 이미 메모리에 다 만들어져 있으므로 BytesIO 스트리밍 없이 한 번에 응답
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                "Content-Disposition": f'attachment; filename="{filename}"'
             }
         )
     
@@ -581,16 +937,15 @@ async def download_pdf(request: dict):
         raise http_err
     except Exception as e:
         # 기타 예외 처리
-        import traceback
-        traceback.print_exc()
+        logger.exception("PDF 생성 오류")
         raise HTTPException(status_code=500, detail=f"PDF 생성 오류: {str(e)}")
 
 @app.post("/api/analyze/multi-agent")
 async def analyze_portfolio_multi_agent(request: PortfolioRequest):
     """멀티 에이전트 포트폴리오 분석"""
-    result = run_multi_agent_portfolio(
+    result = await arun_multi_agent_portfolio(
         budget=request.budget,
-        investment_targets=request.investment_targets,
+        investment_targets=request.investment_targets.model_dump(),
         risk_profile=request.risk_profile,
         investment_period=request.investment_period,
         additional_prompt=request.additional_prompt
@@ -1,3 +1,17 @@
+// ⭐ 자주 쓰는 고정 요소는 시작 시 한 번만 찾아 둠 (defer 스크립트라 이 시점에 DOM 파싱이 끝나 있음)
+const resultContent = document.getElementById('resultContent');
+const loadingState = document.getElementById('loadingState');
+const emptyState = document.getElementById('emptyState');
+const analyzeBtn = document.getElementById('analyzeBtn');
+const progressFill = document.getElementById('progressFill');
+const progressText = document.getElementById('progressText');
+const stepMessageEl = document.getElementById('stepMessage');
+const sectorsList = document.getElementById('sectorsList');
+const stocksList = document.getElementById('stocksList');
+
+// ⭐ 종목 목록은 '종목 선택' 탭을 처음 열 때 한 번만 로드
+let stocksLoaded = false;
+
 // 탭 전환
 document.querySelectorAll('.tab').forEach(tab => {
     tab.addEventListener('click', () => {
@@ -8,83 +22,225 @@ document.querySelectorAll('.tab').forEach(tab => {
         
         tab.classList.add('active');
         document.getElementById(`${tabName}-tab`).classList.add('active');
+        
+        if (tabName === 'stocks' && !stocksLoaded) {
+            stocksLoaded = true;
+            loadStocks();
+        }
     });
 });
 
+// ⭐ Plotly는 처음 필요할 때 한 번만 로드 (plotly-latest(1.x 고정본) 대신 버전 고정 빌드,
+//    sunburst는 basic/cartesian 부분 번들에 없어 전체 빌드 사용)
+const PLOTLY_SRC = 'https://cdn.plot.ly/plotly-2.35.2.min.js';
+let plotlyPromise = null;
+
+// ⭐ 차트는 Plotly.react로 그림 (같은 div면 trace를 diff해서 갱신, 새 div면 newPlot과 동일)
+const PLOTLY_CONFIG = { responsive: true, displayModeBar: false, staticPlot: false };
+let chartsInitialized = false;
+// ⭐ 처음에는 포트폴리오 → 섹터 2단계만 그리고, 섹터를 클릭하면 Plotly가 해당 종목 단계로 확대
+const SUNBURST_MAXDEPTH = 2;
+// ⭐ sunburst 조각이 많을 때 글자가 안 들어가는 조각은 라벨을 숨겨 텍스트 축소/배치 계산을 줄임
+const SUNBURST_UNIFORMTEXT = { minsize: 8, mode: 'hide' };
+
+function loadPlotly() {
+    if (window.Plotly) return Promise.resolve(window.Plotly);
+    if (plotlyPromise) return plotlyPromise;
+    
+    plotlyPromise = new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = PLOTLY_SRC;
+        script.async = true;
+        script.crossOrigin = 'anonymous';
+        script.onload = () => resolve(window.Plotly);
+        script.onerror = () => {
+            plotlyPromise = null; // 다음 요청에서 재시도
+            reject(new Error('Plotly 로드 실패'));
+        };
+        document.head.appendChild(script);
+    });
+    return plotlyPromise;
+}
+
+// ⭐ 페이지 로드가 끝나고 브라우저가 한가할 때 Plotly 번들을 미리 받아 캐시에 올려 둠
+//    (실행은 하지 않으므로 첫 화면에는 영향 없음, 바쁜 브라우저는 idle 콜백이 늦게 와서 자연히 미뤄짐)
+function preloadPlotlyWhenIdle() {
+    if (window.Plotly || plotlyPromise) return;
+    
+    const link = document.createElement('link');
+    link.rel = 'preload';
+    link.as = 'script';
+    link.href = PLOTLY_SRC;
+    link.crossOrigin = 'anonymous';  // loadPlotly()의 script와 같은 CORS 모드여야 캐시를 재사용
+    document.head.appendChild(link);
+}
+
+window.addEventListener('load', () => {
+    if ('requestIdleCallback' in window) {
+        requestIdleCallback(preloadPlotlyWhenIdle, { timeout: 5000 });
+    } else {
+        setTimeout(preloadPlotlyWhenIdle, 2000);
+    }
+}, { once: true });
+
+// ⭐ innerHTML에 넣는 서버/LLM 문자열용 HTML 이스케이프
+//    (특수문자 5개를 표로 찾아 한 번만 훑고, 바꿀 문자가 없으면 원본 문자열을 그대로 반환)
+const ESC = new Array(256).fill(null);
+ESC[38] = '&amp;';
+ESC[60] = '&lt;';
+ESC[62] = '&gt;';
+ESC[34] = '&quot;';
+ESC[39] = '&#39;';
+
+function esc(value) {
+    const s = String(value ?? '');
+    let out = '';
+    let last = 0;
+    for (let i = 0; i < s.length; i++) {
+        const c = s.charCodeAt(i);
+        if (c < 256 && ESC[c]) {
+            out += s.slice(last, i) + ESC[c];
+            last = i + 1;
+        }
+    }
+    return last ? out + s.slice(last) : s;
+}
+
+// ⭐ HTML 조각용 tagged template: 정적 문자열(strings)은 호출 위치별로 캐시되고, 값만 이스케이프해서 이어 붙임
+function h(strings, ...values) {
+    let out = strings[0];
+    for (let i = 0; i < values.length; i++) {
+        out += esc(values[i]) + strings[i + 1];
+    }
+    return out;
+}
+
 // 섹터 리스트 로드
+// ⭐ 서버가 메인 페이지에 인라인해 둔 섹터/모델 목록 + 종목 목록 URL (없으면 /api로 요청)
+const bootstrapData = (() => {
+    const el = document.getElementById('bootstrapData');
+    try {
+        return el ? JSON.parse(el.textContent) : {};
+    } catch (e) {
+        return {};
+    }
+})();
+
+async function fetchJson(url) {
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    return response.json();
+}
+
 async function loadSectors() {
     try {
-        const response = await fetch('/api/sectors');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
+        const data = bootstrapData.sectors ? bootstrapData : await fetchJson('/api/sectors');
         
-        const data = await response.json();
-        
-        const sectorsList = document.getElementById('sectorsList');
         if (!sectorsList) {
             throw new Error('sectorsList 요소를 찾을 수 없습니다');
         }
         
-        sectorsList.innerHTML = data.sectors.map(sector => `
-            <div class="selection-item">
-                <input type="checkbox" id="sector_` + sector + `" name="sectors" value="` + sector + `" onchange="updateCount('sectors')">
-                <label for="sector_` + sector + `">` + sector + `</label>
-            </div>
-        `).join('');
+        // ⭐ HTML 문자열을 파싱하지 않고 템플릿 복제본을 fragment에 모아 한 번에 교체
+        const fragment = document.createDocumentFragment();
+        for (const sector of data.sectors) {
+            fragment.appendChild(buildSelectionItem('sector', 'sectors', sector, sector));
+        }
+        sectorsList.replaceChildren(fragment);
     } catch (error) {
-        const sectorsList = document.getElementById('sectorsList');
         if (sectorsList) {
-            sectorsList.innerHTML = '<p style="color: red;">섹터 로드 실패: ' + error.message + '</p>';
+            sectorsList.innerHTML = '<p class="load-error">섹터 로드 실패: ' + esc(error.message) + '</p>';
         }
     }
 }
 
+// 브라우저에 제어권을 양보 (scheduler.postTask → requestIdleCallback → setTimeout 순으로 사용)
+function yieldToBrowser() {
+    if ('scheduler' in window && typeof scheduler.postTask === 'function') {
+        return scheduler.postTask(() => {}, { priority: 'background' });
+    }
+    if ('requestIdleCallback' in window) {
+        return new Promise(resolve => requestIdleCallback(resolve));
+    }
+    return new Promise(resolve => setTimeout(resolve, 0));
+}
+
+// 체크박스 + 라벨 항목 하나 생성 (index.html의 #selectionItemTpl 복제)
+let selectionItemTpl = null;
+
+function buildSelectionItem(idPrefix, name, value, labelText) {
+    selectionItemTpl ??= document.getElementById('selectionItemTpl').content.firstElementChild;
+    
+    const item = selectionItemTpl.cloneNode(true);
+    const input = item.firstElementChild;
+    const label = item.lastElementChild;
+    
+    input.id = `${idPrefix}_${value}`;
+    input.name = name;
+    input.value = value;
+    label.htmlFor = input.id;
+    label.textContent = labelText;
+    return item;
+}
+
+// ⭐ 종목 목록은 수백 개이므로 50개씩 나눠 유휴 시간에 추가 (긴 작업으로 첫 화면이 막히지 않도록)
+const STOCK_RENDER_CHUNK = 50;
+
+async function renderStocksLazy(stocksList, stocks) {
+    stocksList.replaceChildren();
+    
+    for (let i = 0; i < stocks.length; i += STOCK_RENDER_CHUNK) {
+        await yieldToBrowser();
+        
+        const fragment = document.createDocumentFragment();
+        for (const stock of stocks.slice(i, i + STOCK_RENDER_CHUNK)) {
+            fragment.appendChild(buildSelectionItem('stock', 'stocks', stock.ticker, stock.name));
+        }
+        stocksList.appendChild(fragment);
+    }
+}
+
 // 종목 리스트 로드
 async function loadStocks() {
     try {
-        const response = await fetch('/api/stocks');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-        
-        const data = await response.json();
+        const data = await fetchJson(bootstrapData.stocks_url || '/api/stocks');
         
-        const stocksList = document.getElementById('stocksList');
         if (!stocksList) {
             throw new Error('stocksList 요소를 찾을 수 없습니다');
         }
         
-        stocksList.innerHTML = data.stocks.map(stock => `
-            <div class="selection-item">
-                <input type="checkbox" id="stock_` + stock.ticker + `" name="stocks" value="` + stock.ticker + `" onchange="updateCount('stocks')">
-                <label for="stock_` + stock.ticker + `">` + stock.name + `</label>
-            </div>
-        `).join('');
+        await renderStocksLazy(stocksList, data.stocks);
     } catch (error) {
-        const stocksList = document.getElementById('stocksList');
+        stocksLoaded = false; // 탭을 다시 열면 재시도
         if (stocksList) {
-            stocksList.innerHTML = '<p style="color: red;">종목 로드 실패: ' + error.message + '</p>';
+            stocksList.innerHTML = '<p class="load-error">종목 로드 실패: ' + esc(error.message) + '</p>';
         }
     }
 }
 
-// 사용 가능한 모델 목록 로드
-async function loadAvailableModels() {
-    try {
-        const response = await fetch('/api/models');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-        }
-        
-        const data = await response.json();
-        return data.models;
-    } catch (error) {
-        return ['claude-3-5-sonnet-20241022']; // 기본 fallback
-    }
+// 사용 가능한 모델 목록 로드 (⭐ 진행 중인 요청은 하나로 공유)
+let modelsInflight = null;
+
+function loadAvailableModels() {
+    if (bootstrapData.models) return Promise.resolve(bootstrapData.models);
+    if (modelsInflight) return modelsInflight;
+    
+    modelsInflight = fetchJson('/api/models')
+        .then(data => data.models)
+        .catch(() => ['claude-3-5-sonnet-20241022']) // 기본 fallback
+        .finally(() => { modelsInflight = null; });
+    
+    return modelsInflight;
+}
+
+// 마지막 호출 후 ms 동안 추가 호출이 없을 때만 실행 (trailing-edge)
+function debounce(fn, ms) {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), ms);
+    };
 }
 
 // AI 엔진 변경 시 모델 옵션 업데이트
@@ -98,7 +254,7 @@ async function updateModelOptions() {
         const availableModels = await loadAvailableModels();
         
         modelSelect.innerHTML = availableModels.map(model => 
-            `<option value="${model}">${getModelDisplayName(model)}</option>`
+            `<option value="${esc(model)}">${esc(getModelDisplayName(model))}</option>`
         ).join('');
     } catch (error) {
         modelSelect.innerHTML = '<option value="claude-3-5-sonnet-20241022">Claude 3.5 Sonnet (기본)</option>';
@@ -118,20 +274,43 @@ function getModelDisplayName(modelName) {
     return displayNames[modelName] || modelName;
 }
 
+// ⭐ 라디오 버튼을 빠르게 전환해도 select는 한 번만 다시 그림
+const updateModelOptionsDebounced = debounce(updateModelOptions, 150);
+
 // 엔진 선택 이벤트 리스너 추가
 document.addEventListener('DOMContentLoaded', function() {
     document.querySelectorAll('input[name="aiEngine"]').forEach(radio => {
-        radio.addEventListener('change', updateModelOptions);
+        radio.addEventListener('change', updateModelOptionsDebounced);
     });
     
     // 초기 모델 목록 로드
     updateModelOptions();
 });
 
-// 선택 개수 업데이트
+// ⭐ 선택된 섹터/종목 값을 Set으로 유지 (체크할 때마다 전체 체크박스를 스캔하지 않음)
+const selected = { sectors: new Set(), stocks: new Set() };
+
+// 선택 개수 업데이트 (⭐ 개수 표시 텍스트 노드를 한 번만 찾아 두고 값만 교체)
+const countTextNodes = {};
+
 function updateCount(type) {
-    const count = document.querySelectorAll(`input[name="${type}"]:checked`).length;
-    document.getElementById(`${type}Count`).textContent = `선택: ${count}개`;
+    countTextNodes[type] ??= document.getElementById(`${type}Count`).firstChild;
+    countTextNodes[type].nodeValue = `선택: ${selected[type].size}개`;
+}
+
+// 목록 컨테이너에 change 리스너 하나만 등록 (이벤트 위임)
+function bindSelectionList(type) {
+    document.getElementById(`${type}List`).addEventListener('change', (e) => {
+        const target = e.target;
+        if (!target.matches('input[type="checkbox"]')) return;
+        
+        if (target.checked) {
+            selected[type].add(target.value);
+        } else {
+            selected[type].delete(target.value);
+        }
+        updateCount(type);
+    });
 }
 
 // 로딩 애니메이션 제어 객체
@@ -160,6 +339,8 @@ const LoadingController = {
     estimatedDuration: 15000, // 기본 예상 시간 15초
     
     start: function(engine, model, requestData = null) {
+        // ⭐ 이전 요청의 타이머가 남아 있으면 먼저 정리 (중복 setInterval 방지)
+        this.reset();
         this.startTime = Date.now();
         this.currentStep = 0;
         this.progress = 0;
@@ -172,11 +353,7 @@ const LoadingController = {
             this.estimatedDuration = 20000
         }
         
-        const progressFill = document.getElementById('progressFill');
-        const progressText = document.getElementById('progressText');
-        
         // 초기화
-        const stepMessageEl = document.getElementById('stepMessage');
         if (stepMessageEl) {
             const initialTime = Math.ceil(this.estimatedDuration / 1000);
             const initialMessage = `${this.stepMessages[0]} (${initialTime}초 남음)`;
@@ -194,8 +371,6 @@ const LoadingController = {
     
     activateStep: function(stepIndex) {
         if (stepIndex >= 0 && stepIndex < this.steps.length && stepIndex !== this.currentStep) {
-            const stepMessageEl = document.getElementById('stepMessage');
-            
             if (stepMessageEl) {
                 const message = this.stepMessages[stepIndex];
                 const remainingTime = this.getRemainingTime();
@@ -212,9 +387,6 @@ const LoadingController = {
     },
     
     updateProgress: function(percent) {
-        const progressFill = document.getElementById('progressFill');
-        const progressText = document.getElementById('progressText');
-        
         if (progressFill) {
             progressFill.style.width = `${percent}%`;
         }
@@ -260,9 +432,10 @@ const LoadingController = {
         // 마지막 단계 활성화
         this.activateStep(11);
         
-        // 완료 메시지 표시
+        // 완료 메시지 표시 (그 사이 새 요청이 시작됐으면 건드리지 않음)
+        const startTime = this.startTime;
         setTimeout(() => {
-            const stepMessageEl = document.getElementById('stepMessage');
+            if (this.startTime !== startTime) return;
             if (stepMessageEl) {
                 stepMessageEl.textContent = '분석이 완료되었습니다!';
             }
@@ -280,7 +453,7 @@ const LoadingController = {
         }
         
         setTimeout(() => {
-            this.reset();
+            if (this.startTime === startTime) this.reset();
         }, 1500);
     },
     
@@ -330,7 +503,6 @@ const LoadingController = {
     },
     
     updateTimeDisplay: function() {
-        const stepMessageEl = document.getElementById('stepMessage');
         if (stepMessageEl && this.progress < 95) {
             const message = this.stepMessages[this.currentStep];
             const remainingTime = this.getRemainingTime();
@@ -386,7 +558,7 @@ function startLoadingAnimation(engine, model, requestData = null) {
 }
 
 // 스마트 추정 기반 요청 처리
-async function handleRegularRequest(apiEndpoint, requestData, selectedEngine) {
+async function handleRegularRequest(apiEndpoint, requestData, selectedEngine, signal) {
     const startTime = Date.now();
     
     // LoadingController에서 이미 복잡도 분석과 예상 시간이 설정되어 있음
@@ -411,7 +583,8 @@ async function handleRegularRequest(apiEndpoint, requestData, selectedEngine) {
         const response = await fetch(apiEndpoint, {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify(requestData)
+            body: JSON.stringify(requestData),
+            signal
         });
         
         // 4-6단계: 분석 시작
@@ -425,7 +598,7 @@ async function handleRegularRequest(apiEndpoint, requestData, selectedEngine) {
         if (result.success) {
             // 10-11단계: 차트 생성
             LoadingController.jumpToStep(9, 83); // 차트 생성
-            renderResults(result.report, result.iterations);
+            await renderResults(result.report, result.iterations);
             
             // 12단계: 보고서 작성 완료
             LoadingController.jumpToStep(11, 95);
@@ -433,6 +606,7 @@ async function handleRegularRequest(apiEndpoint, requestData, selectedEngine) {
             setTimeout(() => {
                 LoadingController.complete();
             }, 500);
+            return result;
         } else {
             throw new Error(result.detail || '분석 실패');
         }
@@ -441,10 +615,131 @@ async function handleRegularRequest(apiEndpoint, requestData, selectedEngine) {
     }
 }
 
+// ⭐ 멀티 에이전트 그래프 노드 → 로딩 단계/진행률 매핑
+const STREAM_STAGE_STEPS = {
+    initialization: [2, 25],   // 재무제표 분석
+    financial_agent: [3, 40],  // 관련 뉴스 검색
+    technical_agent: [4, 50],  // 뉴스 분석
+    news_agent: [5, 55],       // 점수 산출
+    aggregator: [6, 60],       // 포트폴리오 구성 분석
+    supervisor: [8, 75],       // 전략 검수
+    validation: [9, 83]        // 차트 생성
+};
+
+// SSE 스트림 요청 처리 (그래프 단계가 끝날 때마다 진행률 갱신, 결과는 도착 즉시 렌더링)
+async function handleStreamRequest(apiEndpoint, requestData, signal) {
+    LoadingController.jumpToStep(0, 8);   // 데이터 수집
+    
+    const response = await fetch(apiEndpoint, {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(requestData),
+        signal
+    });
+    
+    if (!response.ok || !response.body) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || `HTTP ${response.status}: ${response.statusText}`);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let resultEvent = null;
+    
+    while (!resultEvent) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            if (!rawEvent.startsWith('data: ')) continue;
+            const event = JSON.parse(rawEvent.slice(6));
+            if (await handleStreamEvent(event)) {
+                resultEvent = event;
+            }
+        }
+    }
+    
+    if (!resultEvent) {
+        throw new Error('분석 결과를 받지 못했습니다');
+    }
+    return resultEvent;
+}
+
+// 스트림 이벤트 1건 처리 (최종 결과를 렌더링했으면 true 반환)
+async function handleStreamEvent(event) {
+    if (event.stage === 'error') {
+        throw new Error(event.detail || '분석 실패');
+    }
+    
+    if (event.stage === 'result') {
+        LoadingController.jumpToStep(9, 83); // 차트 생성
+        await renderResults(event.report, event.iterations);
+        
+        LoadingController.jumpToStep(11, 95);
+        setTimeout(() => {
+            LoadingController.complete();
+        }, 500);
+        return true;
+    }
+    
+    // ⭐ Supervisor가 끝나면 최종 요약부터 먼저 보여 줌 (표/차트는 result 이벤트에서 렌더링)
+    if (event.stage === 'supervisor' && event.payload && event.payload.ai_summary) {
+        renderSummaryPreview(event.payload.ai_summary);
+    }
+    
+    const step = STREAM_STAGE_STEPS[event.stage];
+    if (step && step[1] > LoadingController.progress) {
+        LoadingController.jumpToStep(step[0], step[1]);
+    }
+    return false;
+}
+
+// ⭐ 재분석 시 이전 차트를 purge해서 Plotly의 resize 리스너/내부 상태를 정리 (결과 화면 교체 전에 호출)
+function purgeCharts() {
+    resetLazyRenders();
+    if (chartsInitialized && window.Plotly) {
+        ['sectorChart', 'performanceChart'].forEach(id => {
+            const chart = document.getElementById(id);
+            if (chart) Plotly.purge(chart);
+        });
+        chartsInitialized = false;
+    }
+}
+
+// 최종 결과 전에 AI 요약만 미리 표시
+function renderSummaryPreview(summary) {
+    purgeCharts();
+    resultContent.innerHTML = h`
+        <div class="section">
+            <div class="section-title">AI 종합 브리핑</div>
+            <div class="summary-box">${summary}</div>
+        </div>
+    `;
+    resultContent.classList.add('active');
+    lastRenderHash = null;   // 미리보기 화면이므로 다음 결과는 항상 전체 렌더링
+    renderGeneration++;
+}
+
 // ⭐ DOM이 완전히 로드된 후 초기 함수 실행
 document.addEventListener('DOMContentLoaded', function() {
+    bindSelectionList('sectors');
+    bindSelectionList('stocks');
+    
+    resultContent.addEventListener('click', (e) => {
+        const btn = e.target.closest('#downloadPdfBtn');
+        if (btn && !btn.disabled) {
+            handlePdfDownload(btn);
+        }
+    });
+    
     loadSectors();
-    loadStocks();
     updateModelOptions();
     
     // 예산 input 초기화
@@ -454,21 +749,28 @@ document.addEventListener('DOMContentLoaded', function() {
     if (budgetInput && budgetDisplay) {
         budgetDisplay.textContent = formatBudget(budgetInput.value);
         
+        // ⭐ 입력 이벤트가 아무리 빨리 와도 표시 갱신은 프레임당 한 번만
+        let budgetFrame = 0;
         budgetInput.addEventListener('input', function() {
-            budgetDisplay.textContent = formatBudget(this.value);
+            if (budgetFrame) return;
+            budgetFrame = requestAnimationFrame(() => {
+                budgetFrame = 0;
+                budgetDisplay.textContent = formatBudget(budgetInput.value);
+            });
         });
     }
 });
 
 // ⭐ 예산 포맷팅 함수
+// (숫자/단위 표는 호출마다 새로 만들지 않도록 모듈 상수로 둠)
+const NUM_KOR = {'0': '', '1': '일', '2': '이', '3': '삼', '4': '사', '5': '오', '6': '육', '7': '칠', '8': '팔', '9': '구'};
+const S_UNIT_KOR = ['', '십', '백', '천'];
+const L_UNIT_KOR = ['', '만', '억', '조', '경'];
+
 function formatBudget(num) {
     num = parseInt(num) || 0;
     if (num <= 0) return '0원';
 
-    const numKor = {'0': '', '1': '일', '2': '이', '3': '삼', '4': '사', '5': '오', '6': '육', '7': '칠', '8': '팔', '9': '구'};
-    const sUnitKor = ['', '십', '백', '천'];
-    const lUnitKor = ['', '만', '억', '조', '경'];
-
     let numStrList = num.toString().split('').reverse();
 
     let result = '';
@@ -480,21 +782,59 @@ function formatBudget(num) {
         for(let j = 0; j < char.length; j++) {
             const n = char.charAt(j);
             if(n === '0') continue;
-            part = numKor[n] + sUnitKor[j] + part;
+            part = NUM_KOR[n] + S_UNIT_KOR[j] + part;
         }
-        result = part + lUnitKor[i] + result;
+        result = part + L_UNIT_KOR[i] + result;
     }
 
     return result + '원';
 }
 
+// ⭐ 재제출 시 진행 중인 분석 요청은 취소하고, 같은 조건의 결과는 잠시 재사용해서 LLM 호출을 다시 하지 않음
+const ANALYSIS_CACHE_TTL_MS = 60 * 1000;
+const ANALYSIS_CACHE_SIZE = 20;
+const analysisCache = new Map();
+let analysisController = null;
+
+function getCachedAnalysis(key) {
+    const cached = analysisCache.get(key);
+    if (!cached) return null;
+    if (Date.now() - cached.time > ANALYSIS_CACHE_TTL_MS) {
+        analysisCache.delete(key);
+        return null;
+    }
+    return cached;
+}
+
+function setCachedAnalysis(key, result) {
+    analysisCache.delete(key);
+    analysisCache.set(key, { time: Date.now(), report: result.report, iterations: result.iterations });
+    if (analysisCache.size > ANALYSIS_CACHE_SIZE) {
+        analysisCache.delete(analysisCache.keys().next().value);
+    }
+}
+
+// 오류 상자 표시 (진행 중이던 섹션 렌더링/지연 렌더링도 중단)
+function renderError(message) {
+    lastRenderHash = null;
+    renderGeneration++;
+    resetLazyRenders();
+    resultContent.innerHTML = `
+        <div class="error-box">
+            <h3>❌ 오류 발생</h3>
+            <p>${esc(message)}</p>
+        </div>
+    `;
+    resultContent.classList.add('active');
+}
+
 // 폼 제출
 document.getElementById('portfolioForm').addEventListener('submit', async (e) => {
     e.preventDefault();
     
     const formData = new FormData(e.target);
-    const selectedSectors = Array.from(document.querySelectorAll('input[name="sectors"]:checked')).map(cb => cb.value);
-    const selectedStocks = Array.from(document.querySelectorAll('input[name="stocks"]:checked')).map(cb => cb.value);
+    const selectedSectors = Array.from(selected.sectors);
+    const selectedStocks = Array.from(selected.stocks);
     const selectedEngine = formData.get('aiEngine');
     const selectedModel = formData.get('model');
     
@@ -520,286 +860,377 @@ document.getElementById('portfolioForm').addEventListener('submit', async (e) =>
         additional_prompt: formData.get('additional_prompt') || ""
     };
     
+    // ⭐ 이전 요청을 취소하면 그 요청의 로딩 타이머도 함께 정리 (캐시 적중으로 바로 그리는 경우 포함)
+    analysisController?.abort();
+    analysisController = null;
+    LoadingController.reset();
+    
+    const cacheKey = apiEndpoint + '\n' + JSON.stringify(requestData);
+    const cached = getCachedAnalysis(cacheKey);
+    if (cached) {
+        emptyState.style.display = 'none';
+        loadingState.hidden = true;
+        analyzeBtn.disabled = false;
+        try {
+            await renderResults(cached.report, cached.iterations);
+        } catch (error) {
+            analysisCache.delete(cacheKey);
+            renderError(error.message);
+        }
+        return;
+    }
+    
+    const controller = new AbortController();
+    analysisController = controller;
+    
     // UI 상태 변경
-    document.getElementById('emptyState').style.display = 'none';
-    document.getElementById('loadingState').style.display = 'flex';
-    document.getElementById('resultContent').classList.remove('active');
-    document.getElementById('analyzeBtn').disabled = true;
+    emptyState.style.display = 'none';
+    loadingState.hidden = false;
+    resultContent.classList.remove('active');
+    analyzeBtn.disabled = true;
     
     // 로딩 애니메이션 시작 (requestData 전달로 스마트 추정)
     startLoadingAnimation(selectedEngine, selectedModel, requestData);
     
+    // ⭐ 분석을 기다리는 동안 차트 라이브러리를 미리 받아 둠
+    loadPlotly().catch(() => {});
+    
     // 선택된 엔진 표시
     const engineDisplay = selectedEngine === 'langgraph' ? 'LangGraph' : 'Anthropic';
 
     try {
-        // 스마트 추정 방식으로 요청 처리
-        await handleRegularRequest(apiEndpoint, requestData, selectedEngine);
+        let result;
+        if (selectedEngine === 'langgraph') {
+            // ⭐ 멀티 에이전트는 단계별 SSE 스트림으로 진행 상황을 받음
+            result = await handleStreamRequest(apiEndpoint + '/stream', requestData, controller.signal);
+        } else {
+            // 스마트 추정 방식으로 요청 처리
+            result = await handleRegularRequest(apiEndpoint, requestData, selectedEngine, controller.signal);
+        }
+        setCachedAnalysis(cacheKey, result);
         
     } catch (error) {
-        LoadingController.complete();
+        // 새 제출로 취소된 요청은 화면을 건드리지 않음 (새 요청이 이어서 그림)
+        if (controller.signal.aborted) return;
         
-        document.getElementById('resultContent').innerHTML = `
-            <div style="background: #fee; border: 2px solid #fcc; border-radius: 12px; padding: 30px; color: #c33;">
-                <h3>❌ 오류 발생</h3>
-                <p style="margin-top: 10px;">${error.message}</p>
-            </div>
-        `;
-        document.getElementById('resultContent').classList.add('active');
+        LoadingController.complete();
+        renderError(error.message);
     } finally {
-        setTimeout(() => {
-            document.getElementById('loadingState').style.display = 'none';
-            document.getElementById('analyzeBtn').disabled = false;
-        }, 1000);
+        if (analysisController === controller) {
+            analysisController = null;
+            setTimeout(() => {
+                loadingState.hidden = true;
+                analyzeBtn.disabled = false;
+            }, 1000);
+        }
     }
 });
 
-// 결과 렌더링 함수
-function renderResults(reportText, iterations) {
-    let data = null;
+// ⭐ 결과 표 행은 index.html의 행 <template>을 복제하고 textContent만 채움
+// (HTML 문자열 재파싱 없이, 셀을 하나씩 createElement 하지도 않음)
+// 점수 막대는 셀마다 div 2개 + 그라데이션 대신 SVG 하나로 그림
+// (그라데이션은 결과 상단의 #scoreGrad 하나를 모든 막대가 공유)
+const SCORE_GRADIENT_DEFS = `
+    <svg width="0" height="0" class="svg-defs" aria-hidden="true">
+        <defs>
+            <linearGradient id="scoreGrad" x1="0" y1="0" x2="1" y2="0">
+                <stop offset="0%" stop-color="#667eea"/>
+                <stop offset="100%" stop-color="#764ba2"/>
+            </linearGradient>
+        </defs>
+    </svg>
+`;
+
+// ⭐ 숫자 포맷터는 한 번만 만들어 두고 재사용 (셀마다 toLocaleString이 포맷터를 새로 만들지 않도록)
+const NUMBER_FMT = new Intl.NumberFormat('ko-KR');
+const PERCENT_FMT = new Intl.NumberFormat('ko-KR', { style: 'percent', minimumFractionDigits: 1, maximumFractionDigits: 1 });
+
+let stockRowTpl = null;
+let scoreRowTpl = null;
+
+function fillScore(cell, score) {
+    cell.querySelector('.score-num').textContent = score + '점';
+    cell.querySelector('rect').setAttribute('width', score);
+}
+
+function buildStockRow(stock, avgScore) {
+    stockRowTpl ??= document.getElementById('stockRowTpl').content.firstElementChild;
+    const tr = stockRowTpl.cloneNode(true);
+    const cells = tr.cells;
     
-    try {
-        // ⭐ 정규식을 변수로 분리하여 안전하게 처리
-        const jsonStart = reportText.indexOf('```json');
-        const jsonEnd = reportText.indexOf('```', jsonStart + 7);
-        
-        if (jsonStart !== -1 && jsonEnd !== -1) {
-            const jsonStr = reportText.substring(jsonStart + 7, jsonEnd).trim();
-            data = JSON.parse(jsonStr);
-        } else {
-            data = JSON.parse(reportText);
-        }
-    } catch (e) {
-        document.getElementById('resultContent').innerHTML = `
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 12px;">
-                <pre style="white-space: pre-wrap; word-wrap: break-word;">${reportText}</pre>
-            </div>
-        `;
-        document.getElementById('resultContent').classList.add('active');
-        return;
+    cells[0].firstChild.textContent = stock.name || stock.ticker;
+    cells[1].firstChild.textContent = stock.sector;
+    cells[2].firstChild.textContent = PERCENT_FMT.format(stock.weight || 0);
+    cells[3].textContent = NUMBER_FMT.format(stock.amount || 0) + '원';
+    cells[4].textContent = (stock.shares || 0) + '주';
+    cells[5].textContent = NUMBER_FMT.format(stock.current_price || 0) + '원';
+    cells[6].textContent = NUMBER_FMT.format(stock.target_price || 0) + '원';
+    cells[7].textContent = NUMBER_FMT.format(stock.stop_loss || 0) + '원';
+    fillScore(cells[8], avgScore);
+    return tr;
+}
+
+function buildScoreRow(stock, avgScore) {
+    scoreRowTpl ??= document.getElementById('scoreRowTpl').content.firstElementChild;
+    const tr = scoreRowTpl.cloneNode(true);
+    const cells = tr.cells;
+    
+    cells[0].querySelector('.name').textContent = stock.name;
+    cells[0].querySelector('.ticker').textContent = '(' + stock.ticker + ')';
+    fillScore(cells[1], stock.scores.data_analysis);
+    fillScore(cells[2], stock.scores.financial);
+    fillScore(cells[3], stock.scores.news);
+    cells[4].firstChild.textContent = avgScore + '점';
+    return tr;
+}
+
+// ⭐ 결과 데이터 FNV-1a 해시 (요약/성과 지표는 제자리 갱신하므로 제외)
+let lastRenderHash = null;
+
+function fnv1a(text) {
+    let h = 2166136261 >>> 0;
+    for (let i = 0; i < text.length; i++) {
+        h ^= text.charCodeAt(i);
+        h = Math.imul(h, 16777619);
     }
+    return h >>> 0;
+}
+
+function hashResultData(data) {
+    const { ai_summary, performance_metrics, ...rest } = data;
+    return fnv1a(JSON.stringify(rest));
+}
+
+function updateSummaryInPlace(data) {
+    const summaryBox = resultContent.querySelector('.summary-box');
+    const metricValues = resultContent.querySelectorAll('.metric-value');
+    const pm = data.performance_metrics;
     
-    // 구조화된 결과 렌더링
-    let html = `
+    // 직전 화면 구조가 다르면(지표 카드 유무 등) 전체 렌더링으로
+    if (!summaryBox || metricValues.length !== (pm ? 4 : 0)) {
+        return false;
+    }
+    
+    summaryBox.textContent = data.ai_summary || '분석 요약 정보 없음';
+    if (pm) {
+        [pm.expected_return, pm.max_drawdown, pm.sharpe_ratio, pm.benchmark_alpha].forEach((value, idx) => {
+            metricValues[idx].firstChild.nodeValue = value || 0;
+        });
+    }
+    return true;
+}
+
+// ⭐ 결과 화면은 섹션 단위로 만들어 프레임마다 하나씩 붙임
+// (AI 요약이 먼저 보이고, 지표/표/차트는 다음 프레임들에서 이어서 렌더링)
+function fragmentFromHtml(html) {
+    const tpl = document.createElement('template');
+    tpl.innerHTML = html;
+    return tpl.content;
+}
+
+function nextFrame() {
+    return new Promise(resolve => requestAnimationFrame(resolve));
+}
+
+// 미리보기/오류 화면이나 새 결과가 들어오면 진행 중이던 섹션 렌더링을 중단하기 위한 세대 번호
+let renderGeneration = 0;
+
+// ⭐ 화면 아래쪽의 무거운 부분(점수 상세 표, Plotly 차트)은 뷰포트 200px 안으로 들어올 때 처음 그림
+// (PDF 저장처럼 전체가 필요할 때는 flushLazyRenders()로 남은 것을 한 번에 그림)
+const lazyRenders = new Map();
+let lazyObserver = null;
+
+function runLazyRender(target) {
+    const render = lazyRenders.get(target);
+    if (!render) return undefined;
+    lazyRenders.delete(target);
+    lazyObserver?.unobserve(target);
+    return render();
+}
+
+function observeLazy(target, render) {
+    if (!('IntersectionObserver' in window)) {
+        render();
+        return;
+    }
+    lazyObserver ??= new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) runLazyRender(entry.target);
+        }
+    }, { rootMargin: '200px' });
+    lazyRenders.set(target, render);
+    lazyObserver.observe(target);
+}
+
+function flushLazyRenders() {
+    return Promise.all([...lazyRenders.keys()].map(runLazyRender));
+}
+
+function resetLazyRenders() {
+    lazyObserver?.disconnect();
+    lazyRenders.clear();
+}
+
+function buildSummarySection(data) {
+    return fragmentFromHtml(SCORE_GRADIENT_DEFS + h`
         <!-- 1. AI 종합 요약 -->
         <div class="section">
             <div class="section-title">AI 종합 브리핑</div>
-            <div class="summary-box">` + (data.ai_summary || '분석 요약 정보 없음') + `</div>
+            <div class="summary-box">${data.ai_summary || '분석 요약 정보 없음'}</div>
         </div>
-    `;
+    `);
+}
+
+// ⭐ 멀티에이전트 전문가 의견 섹션 (discussion_history가 있는 경우만)
+function buildExpertSection(data) {
+    if (!data.discussion_history || data.discussion_history.length === 0) {
+        return null;
+    }
     
-    // ⭐ 멀티에이전트 전문가 의견 표시 (discussion_history가 있는 경우만)
-    if (data.discussion_history && data.discussion_history.length > 0) {
-        html += `
-        <!-- 1.5. 전문가 분석 의견 -->
-        <div class="section">
-            <div class="section-title">전문가 분석 의견</div>
-            <div style="display: grid; gap: 15px;">
-        `;
+    // ⭐ HTML 조각은 배열에 모아 두고 마지막에 한 번만 join (문자열 누적 += 대신)
+    const parts = [`
+    <!-- 1.5. 전문가 분석 의견 -->
+    <div class="section">
+        <div class="section-title">전문가 분석 의견</div>
+        <div class="expert-list">
+    `];
+    
+    data.discussion_history.forEach((opinion, idx) => {
+        // 전문가 타입 감지 (재무/기술/뉴스)
+        // (색상은 index.css / PDF 스타일의 expert-* 클래스로 지정)
+        let expertType = '전문가';
+        let expertClass = '';
+        
+        if (opinion.includes('[재무 전문가]') || opinion.includes('Financial Agent')) {
+            expertType = '재무 전문가';
+            expertClass = 'expert-financial';
+        } else if (opinion.includes('[기술 전문가]') || opinion.includes('Technical Agent')) {
+            expertType = '기술 전문가';
+            expertClass = 'expert-technical';
+        } else if (opinion.includes('[뉴스 전문가]') || opinion.includes('News Agent')) {
+            expertType = '뉴스 전문가';
+            expertClass = 'expert-news';
+        }
         
-        data.discussion_history.forEach((opinion, idx) => {
-            // 전문가 타입 감지 (재무/기술/뉴스)
-            let expertType = '전문가';
-            let expertColor = '#667eea';
-            
-            if (opinion.includes('[재무 전문가]') || opinion.includes('Financial Agent')) {
-                expertType = '재무 전문가';
-                expertColor = '#28a745';
-            } else if (opinion.includes('[기술 전문가]') || opinion.includes('Technical Agent')) {
-                expertType = '기술 전문가';
-                expertColor = '#007bff';
-            } else if (opinion.includes('[뉴스 전문가]') || opinion.includes('News Agent')) {
-                expertType = '뉴스 전문가';
-                expertColor = '#dc3545';
-            }
-            
-            // [재무 전문가] 등 태그 제거
-            let cleanOpinion = opinion
-                .replace(/\[재무 전문가\]\s*/g, '')
-                .replace(/\[기술 전문가\]\s*/g, '')
-                .replace(/\[뉴스 전문가\]\s*/g, '')
-                .replace(/Financial Agent:\s*/gi, '')
-                .replace(/Technical Agent:\s*/gi, '')
-                .replace(/News Agent:\s*/gi, '')
-                .trim();
-            
-            html += `
-                <div style="
-                    background: linear-gradient(135deg, ${expertColor}15 0%, ${expertColor}05 100%);
-                    border-left: 4px solid ${expertColor};
-                    padding: 15px;
-                    border-radius: 8px;
-                    margin-bottom: 10px;
-                ">
-                    <div style="
-                        display: flex;
-                        align-items: center;
-                        gap: 10px;
-                        margin-bottom: 10px;
-                        font-weight: 600;
-                        color: ${expertColor};
-                        font-size: 14px;
-                    ">
-                        <span>${expertType}</span>
-                    </div>
-                    <div style="
-                        line-height: 1.6;
-                        color: #333;
-                        font-size: 13px;
-                        white-space: pre-wrap;
-                    ">${cleanOpinion}</div>
+        // [재무 전문가] 등 태그 제거
+        let cleanOpinion = opinion
+            .replace(/\[재무 전문가\]\s*/g, '')
+            .replace(/\[기술 전문가\]\s*/g, '')
+            .replace(/\[뉴스 전문가\]\s*/g, '')
+            .replace(/Financial Agent:\s*/gi, '')
+            .replace(/Technical Agent:\s*/gi, '')
+            .replace(/News Agent:\s*/gi, '')
+            .trim();
+        
+        parts.push(h`
+            <div class="expert-opinion-card ${expertClass}">
+                <div class="expert-header">
+                    <span>${expertType}</span>
                 </div>
-            `;
-        });
-        
-        html += `
+                <div class="expert-content">${cleanOpinion}</div>
             </div>
+        `);
+    });
+    
+    parts.push(`
         </div>
-        `;
-    }
+    </div>
+    `);
     
-    html += `
+    return fragmentFromHtml(parts.join(''));
+}
+
+// 성과 지표 섹션
+function buildMetricsSection(data) {
+    const parts = [`
         <!-- 2. 성과 지표 -->
         <div class="section">
             <div class="section-title">예상 성과 지표</div>
             <div class="metrics-grid">
-    `;
+    `];
     
     if (data.performance_metrics) {
         const pm = data.performance_metrics;
-        html += `
+        parts.push(h`
             <div class="metric-card">
                 <div class="metric-label">예상 수익률</div>
-                <div class="metric-value">` + (pm.expected_return || 0) + `<span class="metric-unit">%</span></div>
+                <div class="metric-value">${pm.expected_return || 0}<span class="metric-unit">%</span></div>
             </div>
             <div class="metric-card">
                 <div class="metric-label">최대 낙폭 (MDD)</div>
-                <div class="metric-value" style="color: #dc3545;">` + (pm.max_drawdown || 0) + `<span class="metric-unit">%</span></div>
+                <div class="metric-value metric-negative">${pm.max_drawdown || 0}<span class="metric-unit">%</span></div>
             </div>
             <div class="metric-card">
                 <div class="metric-label">샤프 비율</div>
-                <div class="metric-value">` + (pm.sharpe_ratio || 0) + `</div>
+                <div class="metric-value">${pm.sharpe_ratio || 0}</div>
             </div>
             <div class="metric-card">
                 <div class="metric-label">벤치마크 초과수익</div>
-                <div class="metric-value">` + (pm.benchmark_alpha || 0) + `<span class="metric-unit">%p</span></div>
+                <div class="metric-value">${pm.benchmark_alpha || 0}<span class="metric-unit">%p</span></div>
             </div>
-        `;
+        `);
     }
     
-    html += `
+    parts.push(`
             </div>
         </div>
-        
+    `);
+    return fragmentFromHtml(parts.join(''));
+}
+
+// 추천 종목 종합표 + 종목별 점수 섹션
+function buildTableSections(data) {
+    const fragment = fragmentFromHtml(`
         <!-- 3. 추천 종목 종합표 -->
         <div class="section">
             <div class="section-title">추천 종목 종합표</div>
-            <table class="stock-table">
-                <thead>
-                    <tr>
-                        <th>종목명</th>
-                        <th>섹터</th>
-                        <th>비중</th>
-                        <th>투자금액</th>
-                        <th>주식수</th>
-                        <th>현재가</th>
-                        <th>목표가</th>
-                        <th>손절가</th>
-                        <th>종합점수</th>
-                    </tr>
-                </thead>
-                <tbody>
-    `;
-    
-    if (data.portfolio_allocation) {
-        data.portfolio_allocation.forEach(stock => {
-            const avgScore = stock.scores ? 
-                Math.round((stock.scores.data_analysis + stock.scores.financial + stock.scores.news) / 3) : 0;
-            
-            html += `
-                <tr>
-                    <td><strong>` + (stock.name || stock.ticker) + `</strong></td>
-                    <td><span class="badge badge-sector">` + stock.sector + `</span></td>
-                    <td><strong>` + (stock.weight * 100).toFixed(1) + `%</strong></td>
-                    <td>` + (stock.amount || 0).toLocaleString() + `원</td>
-                    <td>` + (stock.shares || 0) + `주</td>
-                    <td>` + (stock.current_price || 0).toLocaleString() + `원</td>
-                    <td style="color: #28a745; font-weight: 600;">` + (stock.target_price || 0).toLocaleString() + `원</td>
-                    <td style="color: #dc3545; font-weight: 600;">` + (stock.stop_loss || 0).toLocaleString() + `원</td>
-                    <td>
-                        <div style="font-weight: 600; margin-bottom: 5px;">` + avgScore + `점</div>
-                        <div class="score-bar">
-                            <div class="score-fill" style="width: ` + avgScore + `%"></div>
-                        </div>
-                    </td>
-                </tr>
-            `;
-        });
-    }
-    
-    html += `
-                </tbody>
-            </table>
+            <div id="stockTableSlot"></div>
         </div>
         
-        <!-- 4. 점수 상세 -->
+        <!-- 4. 점수 상세 (화면에 가까워지면 표를 채움) -->
         <div class="section">
             <div class="section-title">종목별 점수 분석</div>
-            <table class="stock-table">
-                <thead>
-                    <tr>
-                        <th>종목명</th>
-                        <th>데이터 분석 점수</th>
-                        <th>재무 점수</th>
-                        <th>뉴스 점수</th>
-                        <th>평균</th>
-                    </tr>
-                </thead>
-                <tbody>
-    `;
+            <div id="scoreTableSlot" data-lazy="score-detail"></div>
+        </div>
+    `);
     
-    if (data.portfolio_allocation) {
-        data.portfolio_allocation.forEach(stock => {
-            if (stock.scores) {
-                const avgScore = Math.round((stock.scores.data_analysis + stock.scores.financial + stock.scores.news) / 3);
-                html += `
-                    <tr>
-                        <td><strong>` + stock.name + ` <span style="color: #999; font-weight: normal; font-size: 0.9em;">(` + stock.ticker + `)</span></strong></td>
-                        <td>
-                            <div>` + stock.scores.data_analysis + `점</div>
-                            <div class="score-bar">
-                                <div class="score-fill" style="width: ` + stock.scores.data_analysis + `%"></div>
-                            </div>
-                        </td>
-                        <td>
-                            <div>` + stock.scores.financial + `점</div>
-                            <div class="score-bar">
-                                <div class="score-fill" style="width: ` + stock.scores.financial + `%"></div>
-                            </div>
-                        </td>
-                        <td>
-                            <div>` + stock.scores.news + `점</div>
-                            <div class="score-bar">
-                                <div class="score-fill" style="width: ` + stock.scores.news + `%"></div>
-                            </div>
-                        </td>
-                        <td><strong style="color: #667eea; font-size: 1.1em;">` + avgScore + `점</strong></td>
-                    </tr>
-                `;
-            }
-        });
-    }
+    // 표 골격은 index.html의 <template>을 복제해서 사용
+    const stockTable = document.getElementById('stockTableTpl').content.cloneNode(true);
+    const stockBody = stockTable.querySelector('tbody');
+    const portfolio = data.portfolio_allocation || [];
     
-    html += `
-                </tbody>
-            </table>
-        </div>
-        
+    // 평균 점수(avg_score)와 비중순 정렬은 서버가 미리 처리해서 내려줌
+    portfolio.forEach(stock => {
+        stockBody.appendChild(buildStockRow(stock, stock.avg_score ?? 0));
+    });
+    
+    fragment.getElementById('stockTableSlot').replaceWith(stockTable);
+    
+    const scoreSlot = fragment.getElementById('scoreTableSlot');
+    observeLazy(scoreSlot, () => renderScoreDetail(scoreSlot, portfolio));
+    return fragment;
+}
+
+function renderScoreDetail(slot, portfolio) {
+    const scoreTable = document.getElementById('scoreTableTpl').content.cloneNode(true);
+    const scoreBody = scoreTable.querySelector('tbody');
+    
+    portfolio.forEach(stock => {
+        if (stock.scores) {
+            scoreBody.appendChild(buildScoreRow(stock, stock.avg_score ?? 0));
+        }
+    });
+    
+    slot.replaceWith(scoreTable);
+}
+
+// 차트 자리 + 투자 유의사항 + PDF 버튼 (PDF 버튼은 모든 섹션이 붙은 뒤에만 나타남)
+const RESULT_TAIL_HTML = `
         <!-- 5. 섹터 비중 차트 -->
         <div class="section">
             <div class="section-title">포트폴리오 구성</div>
             <div class="chart-container" id="chartContainer">
-                <div id="sectorChart" style="height: 400px; width: 100%;"></div>
+                <div id="sectorChart" class="chart-plot"></div>
             </div>
         </div>
         
@@ -807,14 +1238,14 @@ function renderResults(reportText, iterations) {
         <div class="section">
             <div class="section-title">예상 수익률 추이</div>
             <div class="chart-container">
-                <div id="performanceChart" style="height: 400px; width: 100%;"></div>
+                <div id="performanceChart" class="chart-plot"></div>
             </div>
         </div>
         
         <!-- 투자 책임 경고 -->
-        <div class="disclaimer" style="background: rgba(255, 243, 205, 0.3); border-left: 4px solid #ffc107; border-radius: 8px; padding: 20px; margin-top: 40px;">
-            <p style="color: #495057; font-size: 0.9em; line-height: 1.6; margin: 0;">
-                ⚠️ <strong style="color: #f39c12;">투자 유의사항</strong><br>
+        <div class="disclaimer">
+            <p>
+                ⚠️ <strong>투자 유의사항</strong><br>
                 본 분석 결과는 AI 알고리즘 기반의 참고 자료이며, 투자 권유나 종목 추천이 아닙니다. 
                 과거 데이터와 통계 분석을 기반으로 생성된 정보이므로, 미래 수익을 보장하지 않습니다. 
                 모든 투자 결정과 그에 따른 손익은 투자자 본인의 책임입니다.
@@ -822,190 +1253,218 @@ function renderResults(reportText, iterations) {
         </div>
         
         <!-- ⭐ PDF 다운로드 버튼을 맨 아래에 추가 -->
-        <div style="margin-top: 20px;">
+        <div class="pdf-actions">
             <button id="downloadPdfBtn" class="btn-primary">
                 PDF 다운로드
             </button>
         </div>
-    `;
+`;
+
+// 결과 렌더링 함수
+async function renderResults(report, iterations) {
+    let data = null;
     
-    document.getElementById('resultContent').innerHTML = html;
-    document.getElementById('resultContent').classList.add('active');
+    // ⭐ 서버가 ```json 펜스를 벗겨 낸 report 객체를 그대로 보내므로 파싱 없이 사용
+    // (이전 형식처럼 문자열로 오면 JSON.parse 한 번만 시도하고, 실패하면 원문을 그대로 표시)
+    if (typeof report === 'string') {
+        try {
+            data = JSON.parse(report);
+        } catch (e) {
+            data = null;
+        }
+    } else {
+        data = report;
+    }
     
-    // PDF 다운로드 이벤트 (클론으로 중복 방지)
-    const downloadBtn = document.getElementById('downloadPdfBtn');
-    const newBtn = downloadBtn.cloneNode(true);
-    downloadBtn.parentNode.replaceChild(newBtn, downloadBtn);
+    if (!data || typeof data !== 'object') {
+        resultContent.innerHTML = `
+            <div class="raw-report">
+                <pre>${esc(String(report ?? '분석 결과 형식이 올바르지 않습니다'))}</pre>
+            </div>
+        `;
+        resultContent.classList.add('active');
+        lastRenderHash = null;
+        renderGeneration++;
+        resetLazyRenders();
+        return;
+    }
     
-    newBtn.addEventListener('click', async () => {
-        newBtn.disabled = true;
-        newBtn.textContent = 'PDF 생성 중...';
-        
+    // ⭐ 요약/성과 지표 외에는 직전 렌더링과 같으면 DOM/차트를 다시 만들지 않고 텍스트만 갱신
+    const renderHash = hashResultData(data);
+    if (renderHash === lastRenderHash && updateSummaryInPlace(data)) {
+        resultContent.classList.add('active');
+        return;
+    }
+    lastRenderHash = renderHash;
+    
+    const generation = ++renderGeneration;
+    
+    purgeCharts();
+    resultContent.replaceChildren(buildSummarySection(data));
+    resultContent.classList.add('active');
+    
+    const sections = [
+        () => buildExpertSection(data),
+        () => buildMetricsSection(data),
+        () => buildTableSections(data),
+        () => fragmentFromHtml(RESULT_TAIL_HTML)
+    ];
+    for (const build of sections) {
+        await nextFrame();
+        if (generation !== renderGeneration) return;
+        const section = build();
+        if (section) resultContent.appendChild(section);
+    }
+    
+    // ⭐ 차트는 각 자리가 뷰포트에 가까워질 때 Plotly.react로 그림
+    //    (Plotly.react의 Promise를 그대로 돌려줘서 flushLazyRenders()가 그리기 완료까지 기다림)
+    observeLazy(document.getElementById('sectorChart'), () => loadPlotly().then(() => {
+        if (generation !== renderGeneration) return;
+        return renderSunburstFromConfig(data.chart_config, data.portfolio_allocation);
+    }).catch(() => {}));
+    observeLazy(document.getElementById('performanceChart'), () => loadPlotly().then(() => {
+        if (generation !== renderGeneration) return;
+        return renderPerformanceChart(data);
+    }).catch(() => {}));
+}
+
+// ⭐ renderResults 함수 끝
+
+// ⭐ PDF 요청 본문(HTML 조립 + gzip 압축)은 워커에서 만들어 ArrayBuffer로 돌려받음
+const PDF_WORKER_SRC = '/static/pdfBuilder.worker.js';
+let pdfWorker = null;
+let pdfJobId = 0;
+const pdfJobs = new Map();
+
+function getPdfWorker() {
+    if (pdfWorker) return pdfWorker;
+    
+    pdfWorker = new Worker(PDF_WORKER_SRC);
+    pdfWorker.onmessage = (e) => {
+        const { id, buffer, gzip, error } = e.data;
+        const job = pdfJobs.get(id);
+        if (!job) return;
+        pdfJobs.delete(id);
+        
+        if (error) {
+            job.reject(new Error(error));
+        } else {
+            job.resolve({ buffer, gzip });
+        }
+    };
+    pdfWorker.onerror = (e) => {
+        // 워커 자체가 죽으면 대기 중인 요청을 모두 실패 처리하고 다음에 새로 생성
+        pdfJobs.forEach(job => job.reject(new Error(e.message || 'PDF 워커 오류')));
+        pdfJobs.clear();
+        pdfWorker.terminate();
+        pdfWorker = null;
+    };
+    return pdfWorker;
+}
+
+function buildPdfPayload(resultHtml, now) {
+    return new Promise((resolve, reject) => {
+        const id = ++pdfJobId;
+        pdfJobs.set(id, { resolve, reject });
+        getPdfWorker().postMessage({ id, html: resultHtml, now });
+    });
+}
+
+// ⭐ Plotly가 <head>에 넣는 전역 스타일 (SVG 레이어 겹침, 라벨/범례 규칙 등)
+//    규칙을 CSSOM(insertRule)으로 넣어서 textContent가 비어 있으므로 cssRules에서 직접 꺼냄
+function plotlyGlobalStyleHtml() {
+    const style = document.getElementById('plotly.js-style-global');
+    if (!style || !style.sheet) return '';
+    
+    const rules = [];
+    for (const rule of style.sheet.cssRules) {
+        rules.push(rule.cssText);
+    }
+    return `<style>${rules.join('\n')}</style>`;
+}
+
+// PDF용 결과 HTML 스냅샷 (화면에서는 2단계만 보이는 Sunburst를 잠시 3단계 전체로 펼쳐서 캡처)
+// ⭐ PDF 페이지는 Plotly.js를 로드하지 않으므로 Plotly 전역 스타일을 스냅샷 앞에 함께 붙여 보냄
+async function snapshotResultHtml() {
+    // 아직 스크롤하지 않아 그려지지 않은 표/차트도 PDF에는 들어가야 하므로 먼저 모두 그림
+    await flushLazyRenders();
+    
+    const chart = document.getElementById('sectorChart');
+    if (!chart || !chart.data || !window.Plotly) {
+        return plotlyGlobalStyleHtml() + resultContent.innerHTML;
+    }
+    
+    await Plotly.restyle(chart, { maxdepth: 3, level: '' });
+    try {
+        return plotlyGlobalStyleHtml() + resultContent.innerHTML;
+    } finally {
+        await Plotly.restyle(chart, { maxdepth: SUNBURST_MAXDEPTH });
+    }
+}
+
+// ⭐ PDF 다운로드 (버튼은 렌더링마다 새로 만들어지므로 #resultContent에 한 번만 위임 등록)
+async function handlePdfDownload(btn) {
+    const fileName = `portfolio_analysis_${new Date().getTime()}.pdf`;
+    
+    // ⭐ File System Access API가 있으면 저장 위치를 먼저 받아 두고 응답을 파일로 바로 흘려보냄
+    //    (사용자 클릭 직후에만 호출 가능하므로 PDF 생성 요청보다 먼저 호출)
+    let fileHandle = null;
+    if (window.showSaveFilePicker) {
         try {
-            const resultHtml = document.getElementById('resultContent').innerHTML;
-            
-            const fullHtml = `
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <style>
-                        * { margin: 0; padding: 0; box-sizing: border-box; }
-                        body { 
-                            font-family: 'Pretendard', sans-serif; 
-                            padding: 20px;
-                            font-size: 14px;
-                        }
-                        .section { margin-bottom: 30px; page-break-inside: avoid; }
-                        .section-title { 
-                            font-size: 22px; 
-                            color: #667eea; 
-                            margin-bottom: 15px; 
-                            padding-bottom: 10px; 
-                            border-bottom: 2px solid #667eea; 
-                        }
-                        .summary-box {
-                            background: #f8f9fa;
-                            border-left: 4px solid #667eea;
-                            padding: 15px;
-                            margin: 10px 0;
-                            line-height: 1.6;
-                        }
-                        .metrics-grid { 
-                            display: grid; 
-                            grid-template-columns: repeat(4, 1fr); 
-                            gap: 15px; 
-                            margin: 20px 0; 
-                        }
-                        .metric-card {
-                            border: 2px solid #e9ecef;
-                            padding: 15px;
-                            text-align: center;
-                            border-radius: 8px;
-                        }
-                        .metric-label { font-size: 12px; color: #666; margin-bottom: 8px; }
-                        .metric-value { font-size: 28px; font-weight: bold; color: #667eea; }
-                        .metric-unit { font-size: 14px; color: #999; }
-                        .stock-table {
-                            width: 100%;
-                            border-collapse: collapse;
-                            margin: 20px 0;
-                        }
-                        .stock-table th {
-                            background: #f8f9fa;
-                            padding: 10px;
-                            text-align: left;
-                            border-bottom: 2px solid #dee2e6;
-                            font-size: 10px;
-                        }
-                        .stock-table td {
-                            padding: 8px;
-                            border-bottom: 1px solid #e9ecef;
-                            font-size: 9px;
-                        }
-                        .score-bar {
-                            width: 60px;
-                            height: 6px;
-                            background: #e9ecef;
-                            border-radius: 3px;
-                            overflow: hidden;
-                            margin-top: 3px;
-                        }
-                        .score-fill {
-                            height: 100%;
-                            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-                        }
-                        .badge {
-                            display: inline-block;
-                            padding: 3px 8px;
-                            border-radius: 4px;
-                            font-size: 9px;
-                            font-weight: 600;
-                        }
-                        .badge-sector { background: #e7f3ff; color: #0066cc; }
-                        h1 { 
-                            color: #667eea; 
-                            text-align: center; 
-                            margin-bottom: 30px;
-                            font-size: 28px;
-                        }
-                        .btn-primary { display: none !important; }
-                        #downloadPdfBtn { display: none !important; }
-                        /* 차트는 이제 표시됩니다! */
-                        
-                        /* ⭐ 전문가 의견 스타일 (PDF용) */
-                        .expert-opinion-card {
-                            background: #f8f9fa;
-                            border-left: 4px solid #667eea;
-                            padding: 12px;
-                            border-radius: 6px;
-                            margin-bottom: 12px;
-                            page-break-inside: avoid;
-                        }
-                        .expert-header {
-                            display: flex;
-                            align-items: center;
-                            gap: 8px;
-                            margin-bottom: 8px;
-                            font-weight: 600;
-                            font-size: 12px;
-                        }
-                        .expert-content {
-                            line-height: 1.5;
-                            color: #333;
-                            font-size: 10px;
-                            white-space: pre-wrap;
-                        }
-                    </style>
-                </head>
-                <body>
-                    <h1>AI 투자 포트폴리오 분석 보고서</h1>
-                    <p style="text-align: center; color: #666; margin-bottom: 40px;">
-                        생성일시: ${new Date().toLocaleString('ko-KR')}
-                    </p>
-                    ${resultHtml}
-                </body>
-                </html>
-            `;
-            
-            const response = await fetch('/api/download-pdf', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({ html: fullHtml })
+            fileHandle = await window.showSaveFilePicker({
+                suggestedName: fileName,
+                types: [{ description: 'PDF', accept: { 'application/pdf': ['.pdf'] } }]
             });
-            
-            if (!response.ok) throw new Error('PDF 생성 실패');
-            
+        } catch (error) {
+            if (error.name === 'AbortError') return;  // 사용자가 저장 취소
+            fileHandle = null;  // 그 외에는 기존 다운로드 방식으로
+        }
+    }
+    
+    btn.disabled = true;
+    btn.textContent = 'PDF 생성 중...';
+    
+    try {
+        const resultHtml = await snapshotResultHtml();
+        const { buffer, gzip } = await buildPdfPayload(resultHtml, new Date().toLocaleString('ko-KR'));
+        
+        const headers = {'Content-Type': 'application/json'};
+        if (gzip) headers['Content-Encoding'] = 'gzip';
+        
+        const response = await fetch('/api/download-pdf', {
+            method: 'POST',
+            headers: headers,
+            body: buffer
+        });
+        
+        if (!response.ok) throw new Error('PDF 생성 실패');
+        
+        if (fileHandle) {
+            // 응답 스트림을 그대로 파일에 기록 (전체 PDF를 메모리에 Blob으로 올리지 않음)
+            const writable = await fileHandle.createWritable();
+            await response.body.pipeTo(writable);
+        } else {
             const blob = await response.blob();
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = `portfolio_analysis_${new Date().getTime()}.pdf`;
+            a.download = fileName;
             document.body.appendChild(a);
             a.click();
             window.URL.revokeObjectURL(url);
             document.body.removeChild(a);
-            
-            newBtn.textContent = 'PDF 다운로드';
-            newBtn.disabled = false;
-        } catch (error) {
-            alert('PDF 다운로드 실패: ' + error.message);
-            newBtn.textContent = 'PDF 다운로드';
-            newBtn.disabled = false;
         }
-    });
-    
-    setTimeout(() => {
-        renderSunburstFromConfig(data.chart_config);
-        renderPerformanceChart(data);
-    }, 300);
+    } catch (error) {
+        alert('PDF 다운로드 실패: ' + error.message);
+    } finally {
+        btn.textContent = 'PDF 다운로드';
+        btn.disabled = false;
+    }
 }
 
-// ⭐ renderResults 함수 끝
-function renderSunburstFromConfig(config) {
+function renderSunburstFromConfig(config, portfolio) {
     if (!config) {
-        createSunburstFromData(data.portfolio_allocation);
-        return;
+        return createSunburstFromData(portfolio);
     }
     
     try {
@@ -1022,7 +1481,7 @@ function renderSunburstFromConfig(config) {
             textfont: { size: 12, color: 'white', family: 'Pretendard, Arial, sans-serif' },  // ⭐ 흰색
             textinfo: 'label',  // ⭐ 라벨만 표시
             hovertemplate: '<b>%{label}</b><br>비중: %{value:.1f}%<extra></extra>',
-            maxdepth: 3,  // 🔥 3단계 구조 지원
+            maxdepth: SUNBURST_MAXDEPTH,
             rotation: 0,  // 회전 각도 고정
             sort: false   // 정렬 비활성화로 완전한 원 유지
         }];
@@ -1036,98 +1495,104 @@ function renderSunburstFromConfig(config) {
             width: null,
             height: 400  // ⭐ 390 → 400으로 10px 증가
         };
+        if (!layout.uniformtext) {
+            layout.uniformtext = SUNBURST_UNIFORMTEXT;
+        }
         
-        Plotly.newPlot('sectorChart', chartData, layout, {
-            responsive: true,
-            displayModeBar: false,
-            staticPlot: false
-        });
+        chartsInitialized = true;
+        return Plotly.react('sectorChart', chartData, layout, PLOTLY_CONFIG);
         
     } catch (e) {
-        createSunburstFromData(data.portfolio_allocation);
+        return createSunburstFromData(portfolio);
     }
 }
 
+// ⭐ 섹터 기본 색상 (24비트 정수로 미리 변환해 두고 종목별 밝기 계산은 정수 연산으로)
+const SECTOR_COLOR_MAP = {
+    '반도체': '#4A5FC1',
+    '바이오': '#5C3D7C',
+    '방산': '#C94E8C',
+    '통신': '#2A7FBA',
+    '원자력': '#2D8F5C',
+    '전력망': '#D63D5C',
+    '조선': '#DAA520',
+    'AI': '#FF6B9D',
+    '기타': '#1B8B8B'
+};
+const DEFAULT_SECTOR_COLOR = '#1B8B8B';
+
+function parseHex(hex) {
+    return parseInt(hex.slice(1), 16);
+}
+
+const SECTOR_BASE_RGB = {};
+for (const sector in SECTOR_COLOR_MAP) {
+    SECTOR_BASE_RGB[sector] = parseHex(SECTOR_COLOR_MAP[sector]);
+}
+const DEFAULT_SECTOR_RGB = parseHex(DEFAULT_SECTOR_COLOR);
+
+function lightenColor(rgbInt, level) {
+    const factor = 1 + (level * 0.15);
+    const r = Math.min(255, ((rgbInt >> 16) & 255) * factor | 0);
+    const g = Math.min(255, ((rgbInt >> 8) & 255) * factor | 0);
+    const b = Math.min(255, (rgbInt & 255) * factor | 0);
+    return 'rgb(' + r + ',' + g + ',' + b + ')';
+}
+
 // ⭐ Sunburst 차트를 직접 생성하는 함수 (백업용) - 3단계 구조
 function createSunburstFromData(portfolio) {
     if (!portfolio || portfolio.length === 0) {
         return;
     }
     
-    const colorMap = {
-        '반도체': '#4A5FC1',
-        '바이오': '#5C3D7C',
-        '방산': '#C94E8C',
-        '통신': '#2A7FBA',
-        '원자력': '#2D8F5C',
-        '전력망': '#D63D5C',
-        '조선': '#DAA520',
-        'AI': '#FF6B9D',
-        '기타': '#1B8B8B'
-    };
-    
-    function lightenColor(hex, level) {
-        if (hex.startsWith('rgb')) return hex;
-        
-        let r = parseInt(hex.slice(1, 3), 16);
-        let g = parseInt(hex.slice(3, 5), 16);
-        let b = parseInt(hex.slice(5, 7), 16);
-        
-        const factor = 1 + (level * 0.15);
-        r = Math.min(255, Math.floor(r * factor));
-        g = Math.min(255, Math.floor(g * factor));
-        b = Math.min(255, Math.floor(b * factor));
-        
-        return `rgb(${r},${g},${b})`;
-    }
-    
-    // 데이터 구조 생성
-    const labels = [];
-    const parents = [];
-    const values = [];
-    const colors = [];
-    
+    // ⭐ 한 번 순회하면서 섹터별 그룹핑 + 섹터 합계 + 전체 합계를 같이 계산
     const sectorMap = {};
-    portfolio.forEach(stock => {
+    const sectorTotals = {};
+    let totalPortfolioValue = 0;
+    for (const stock of portfolio) {
         const sector = stock.sector || '기타';
-        if (!sectorMap[sector]) {
-            sectorMap[sector] = [];
-        }
-        sectorMap[sector].push(stock);
-    });
+        const weight = (stock.weight || 0) * 100;
+        (sectorMap[sector] ||= []).push(stock);
+        sectorTotals[sector] = (sectorTotals[sector] || 0) + weight;
+        totalPortfolioValue += weight;
+    }
+    
+    // ⭐ 노드 수(루트 + 섹터 + 종목)가 정해져 있으므로 고정 길이로 만들어 인덱스로 채움
+    //    (values는 Float64Array: 'total' 모드에서 부모 합계와 자식 합이 어긋나지 않도록 double 유지)
+    const sectorKeys = Object.keys(sectorMap);
+    const n = 1 + sectorKeys.length + portfolio.length;
+    const labels = new Array(n);
+    const parents = new Array(n);
+    const values = new Float64Array(n);
+    const colors = new Array(n);
+    let i = 0;
     
     // 1. 루트 노드 "포트폴리오" 추가
-    const totalPortfolioValue = portfolio.reduce((sum, stock) => sum + ((stock.weight || 0) * 100), 0);
-    labels.push('포트폴리오');
-    parents.push('');
-    values.push(totalPortfolioValue);
-    colors.push('#FFFFFF');
-    
-    // 2. 섹터들 추가 (부모: 포트폴리오)
-    Object.entries(sectorMap).forEach(([sector, stocks]) => {
-        labels.push(sector);
-        parents.push('포트폴리오');
-        
-        const sectorTotal = stocks.reduce((sum, stock) => sum + ((stock.weight || 0) * 100), 0);
-        values.push(sectorTotal);
-        colors.push(colorMap[sector] || '#1B8B8B');
-    });
+    labels[i] = '포트폴리오';
+    parents[i] = '';
+    values[i] = totalPortfolioValue;
+    colors[i] = '#FFFFFF';
+    i++;
     
-    // 3. 종목들 추가 (부모: 각 섹터)
-    Object.entries(sectorMap).forEach(([sector, stocks]) => {
-        stocks.forEach((stock, idx) => {
-            const stockName = stock.name || stock.ticker;
-            const stockWeight = (stock.weight || 0) * 100;
-            
-            labels.push(stockName);
-            parents.push(sector);
-            values.push(stockWeight);
-            
-            const baseColor = colorMap[sector] || '#1B8B8B';
-            const lighterColor = lightenColor(baseColor, idx);
-            colors.push(lighterColor);
+    // 2. 섹터(부모: 포트폴리오)와 그 종목들(부모: 각 섹터)을 이어서 추가
+    for (const sector of sectorKeys) {
+        const baseColor = SECTOR_COLOR_MAP[sector] || DEFAULT_SECTOR_COLOR;
+        const baseRgb = SECTOR_BASE_RGB[sector] ?? DEFAULT_SECTOR_RGB;
+        
+        labels[i] = sector;
+        parents[i] = '포트폴리오';
+        values[i] = sectorTotals[sector];
+        colors[i] = baseColor;
+        i++;
+        
+        sectorMap[sector].forEach((stock, idx) => {
+            labels[i] = stock.name || stock.ticker;
+            parents[i] = sector;
+            values[i] = (stock.weight || 0) * 100;
+            colors[i] = lightenColor(baseRgb, idx);
+            i++;
         });
-    });
+    }
     
     // Plotly로 차트 생성
     const chartData = [{
@@ -1143,7 +1608,7 @@ function createSunburstFromData(portfolio) {
         textfont: { size: 12, color: 'white', family: 'Pretendard, Arial, sans-serif' },  // ⭐ 흰색
         textinfo: 'label',  // ⭐ 라벨만 표시
         hovertemplate: '<b>%{label}</b><br>비중: %{value:.1f}%<extra></extra>',
-        maxdepth: 3,  // 🔥 3단계 구조 지원
+        maxdepth: SUNBURST_MAXDEPTH,
         rotation: 0,
         sort: false
     }];
@@ -1155,20 +1620,68 @@ function createSunburstFromData(portfolio) {
         plot_bgcolor: 'rgba(0,0,0,0)',
         autosize: true,
         width: null,
-        height: 400  // ⭐ 390 → 400으로 10px 증가
+        height: 400,  // ⭐ 390 → 400으로 10px 증가
+        uniformtext: SUNBURST_UNIFORMTEXT
     };
     
     try {
-        Plotly.newPlot('sectorChart', chartData, layout, {
-            responsive: true,
-            displayModeBar: false,
-            staticPlot: false
-        });
+        chartsInitialized = true;
+        return Plotly.react('sectorChart', chartData, layout, PLOTLY_CONFIG);
     } catch (e) {
         // Error handling
     }
 }
 
+// ⭐ 수익률 차트 포인트가 이 개수를 넘으면 LTTB로 줄이고 WebGL(scattergl)로 그림
+// (지금처럼 몇십 개월치면 그대로 SVG spline)
+const MAX_CHART_POINTS = 2000;
+
+// Largest-Triangle-Three-Buckets 다운샘플링: 남길 포인트의 인덱스 배열을 반환
+// 첫/마지막 포인트는 유지하고, 가운데는 threshold-2개 버킷마다
+// "이전에 고른 점 - 후보 - 다음 버킷 평균점" 삼각형 넓이가 가장 큰 후보 하나를 고름
+function lttbIndices(xs, ys, threshold) {
+    const n = xs.length;
+    if (threshold >= n || threshold < 3) {
+        return Array.from({ length: n }, (_, i) => i);
+    }
+    
+    const picked = [0];
+    const bucketSize = (n - 2) / (threshold - 2);
+    let a = 0;
+    
+    for (let bucket = 0; bucket < threshold - 2; bucket++) {
+        // 다음 버킷의 평균점
+        const nextStart = Math.floor((bucket + 1) * bucketSize) + 1;
+        const nextEnd = Math.min(Math.floor((bucket + 2) * bucketSize) + 1, n);
+        let avgX = 0, avgY = 0;
+        for (let i = nextStart; i < nextEnd; i++) {
+            avgX += xs[i];
+            avgY += ys[i];
+        }
+        const count = Math.max(nextEnd - nextStart, 1);
+        avgX /= count;
+        avgY /= count;
+        
+        // 현재 버킷에서 삼각형 넓이가 최대인 점
+        const start = Math.floor(bucket * bucketSize) + 1;
+        const end = Math.floor((bucket + 1) * bucketSize) + 1;
+        let maxArea = -1;
+        let next = start;
+        for (let i = start; i < end; i++) {
+            const area = Math.abs((xs[a] - avgX) * (ys[i] - ys[a]) - (xs[a] - xs[i]) * (avgY - ys[a]));
+            if (area > maxArea) {
+                maxArea = area;
+                next = i;
+            }
+        }
+        picked.push(next);
+        a = next;
+    }
+    
+    picked.push(n - 1);
+    return picked;
+}
+
 // ⭐ 수익률 차트 전용 함수 - Plotly.js로 변경
 function renderPerformanceChart(data) {
     const perfContainer = document.getElementById('performanceChart');
@@ -1190,19 +1703,10 @@ function renderPerformanceChart(data) {
     
     if (!perfData) {
         perfContainer.innerHTML = `
-            <div style="
-                display: flex; 
-                flex-direction: column; 
-                align-items: center; 
-                justify-content: center; 
-                height: 100%; 
-                color: #666;
-                text-align: center;
-                padding: 40px;
-            ">
-                <div style="font-size: 48px; margin-bottom: 20px; opacity: 0.3;">📊</div>
-                <h3 style="color: #dc3545; margin-bottom: 10px;">수익률 데이터 생성 실패</h3>
-                <p style="color: #666; line-height: 1.6;">
+            <div class="chart-empty">
+                <div class="chart-empty-icon">📊</div>
+                <h3>수익률 데이터 생성 실패</h3>
+                <p>
                     AI 모델에서 수익률 예측 데이터를 생성하지 못했습니다.<br>
                     다른 조건으로 다시 분석해보시거나, 잠시 후 재시도해주세요.
                 </p>
@@ -1212,18 +1716,33 @@ function renderPerformanceChart(data) {
     }
     
     try {
+        let { months, portfolio, benchmark } = perfData;
+        const useGL = months.length > MAX_CHART_POINTS;
+        
+        if (useGL) {
+            // 포트폴리오 곡선 기준으로 고른 인덱스를 벤치마크에도 그대로 적용 (x축 공유)
+            const idx = lttbIndices(months.map(Number), portfolio, MAX_CHART_POINTS);
+            months = idx.map(i => months[i]);
+            portfolio = Float32Array.from(idx, i => portfolio[i]);
+            benchmark = Float32Array.from(idx, i => benchmark[i]);
+        }
+        
+        const xLabels = months.map(m => m + '개월');
+        const traceType = useGL ? 'scattergl' : 'scatter';
+        const lineShape = useGL ? 'linear' : 'spline';  // scattergl은 spline을 지원하지 않음
+        
         // Plotly 라인 차트 데이터
         const chartData = [
             {
-                x: perfData.months.map(m => m + '개월'),
-                y: perfData.portfolio,
-                type: 'scatter',
+                x: xLabels,
+                y: portfolio,
+                type: traceType,
                 mode: 'lines+markers',
                 name: '포트폴리오',
                 line: {
                     color: '#667eea',
                     width: 3,
-                    shape: 'spline'
+                    shape: lineShape
                 },
                 fill: 'tonexty',
                 fillcolor: 'rgba(102, 126, 234, 0.1)',
@@ -1234,16 +1753,16 @@ function renderPerformanceChart(data) {
                 hovertemplate: '<b>포트폴리오</b><br>기간: %{x}<br>수익률: %{y:.1f}%<extra></extra>'
             },
             {
-                x: perfData.months.map(m => m + '개월'),
-                y: perfData.benchmark,
-                type: 'scatter',
+                x: xLabels,
+                y: benchmark,
+                type: traceType,
                 mode: 'lines+markers',
                 name: '벤치마크 (KOSPI)',
                 line: {
                     color: '#999',
                     width: 2,
                     dash: 'dash',
-                    shape: 'spline'
+                    shape: lineShape
                 },
                 fill: 'tozeroy',
                 fillcolor: 'rgba(153, 153, 153, 0.1)',
@@ -1306,11 +1825,8 @@ function renderPerformanceChart(data) {
             showlegend: true
         };
         
-        Plotly.newPlot('performanceChart', chartData, layout, {
-            responsive: true,
-            displayModeBar: false,
-            staticPlot: false
-        });
+        chartsInitialized = true;
+        return Plotly.react('performanceChart', chartData, layout, PLOTLY_CONFIG);
         
     } catch (e) {
         // Error handling
@@ -0,0 +1,183 @@
+// ⭐ PDF용 HTML 조립 + gzip 압축 워커
+//    (큰 결과 HTML 문자열 처리와 압축을 메인 스레드 밖에서 수행)
+
+// PDF 전용 스타일 (정적인 문자열이므로 모듈 로드 시 한 번만 만들어 둠)
+const PDF_STYLE_BLOCK = `
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
+            font-family: 'Pretendard', sans-serif; 
+            padding: 20px;
+            font-size: 14px;
+        }
+        .section { margin-bottom: 30px; page-break-inside: avoid; }
+        .section-title { 
+            font-size: 22px; 
+            color: #667eea; 
+            margin-bottom: 15px; 
+            padding-bottom: 10px; 
+            border-bottom: 2px solid #667eea; 
+        }
+        .summary-box {
+            background: #f8f9fa;
+            border-left: 4px solid #667eea;
+            padding: 15px;
+            margin: 10px 0;
+            line-height: 1.6;
+        }
+        .metrics-grid { 
+            display: grid; 
+            grid-template-columns: repeat(4, 1fr); 
+            gap: 15px; 
+            margin: 20px 0; 
+        }
+        .metric-card {
+            border: 2px solid #e9ecef;
+            padding: 15px;
+            text-align: center;
+            border-radius: 8px;
+        }
+        .metric-label { font-size: 12px; color: #666; margin-bottom: 8px; }
+        .metric-value { font-size: 28px; font-weight: bold; color: #667eea; }
+        .metric-unit { font-size: 14px; color: #999; }
+        .stock-table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }
+        .stock-table th {
+            background: #f8f9fa;
+            padding: 10px;
+            text-align: left;
+            border-bottom: 2px solid #dee2e6;
+            font-size: 10px;
+        }
+        .stock-table td {
+            padding: 8px;
+            border-bottom: 1px solid #e9ecef;
+            font-size: 9px;
+        }
+        .score-bar {
+            display: block;
+            width: 60px;
+            height: 6px;
+            background: #e9ecef;
+            border-radius: 3px;
+            overflow: hidden;
+            margin-top: 3px;
+        }
+        .badge {
+            display: inline-block;
+            padding: 3px 8px;
+            border-radius: 4px;
+            font-size: 9px;
+            font-weight: 600;
+        }
+        .badge-sector { background: #e7f3ff; color: #0066cc; }
+        h1 { 
+            color: #667eea; 
+            text-align: center; 
+            margin-bottom: 30px;
+            font-size: 28px;
+        }
+        .btn-primary { display: none !important; }
+        #downloadPdfBtn { display: none !important; }
+        /* 차트는 이제 표시됩니다! */
+        
+        /* ⭐ 전문가 의견 스타일 (PDF용) */
+        .expert-opinion-card {
+            background: #f8f9fa;
+            border-left: 4px solid #667eea;
+            padding: 12px;
+            border-radius: 6px;
+            margin-bottom: 12px;
+            page-break-inside: avoid;
+        }
+        .expert-header {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            margin-bottom: 8px;
+            font-weight: 600;
+            font-size: 12px;
+        }
+        .expert-content {
+            line-height: 1.5;
+            color: #333;
+            font-size: 10px;
+            white-space: pre-wrap;
+        }
+        .expert-financial { border-left-color: #28a745; }
+        .expert-financial .expert-header { color: #28a745; }
+        .expert-technical { border-left-color: #007bff; }
+        .expert-technical .expert-header { color: #007bff; }
+        .expert-news { border-left-color: #dc3545; }
+        .expert-news .expert-header { color: #dc3545; }
+        
+        /* 결과 화면과 같은 클래스 (화면에서 inline style 대신 클래스로 옮긴 것들) */
+        .metric-value.metric-negative { color: #dc3545; }
+        .price-target { color: #28a745; font-weight: 600; }
+        .price-stop { color: #dc3545; font-weight: 600; }
+        .score-num-avg { font-weight: 600; margin-bottom: 5px; }
+        .stock-table .ticker { color: #999; font-weight: normal; font-size: 0.9em; }
+        .avg-score { color: #667eea; font-size: 1.1em; }
+        .svg-defs { position: absolute; }
+        .chart-plot { height: 400px; width: 100%; }
+        .disclaimer {
+            background: rgba(255, 243, 205, 0.3);
+            border-left: 4px solid #ffc107;
+            border-radius: 8px;
+            padding: 20px;
+            margin-top: 40px;
+        }
+        .disclaimer p { color: #495057; font-size: 0.9em; line-height: 1.6; margin: 0; }
+        .disclaimer strong { color: #f39c12; }
+    </style>
+`;
+
+// 결과 HTML/생성일시 자리만 표시해 둔 PDF 문서 골격
+const PDF_TEMPLATE = `
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+` + PDF_STYLE_BLOCK + `
+    </head>
+    <body>
+        <h1>AI 투자 포트폴리오 분석 보고서</h1>
+        <p style="text-align: center; color: #666; margin-bottom: 40px;">
+            생성일시: %DATE%
+        </p>
+        %RESULT%
+    </body>
+    </html>
+`;
+
+// ⭐ 생성일시(%DATE%)는 서버가 PDF 캐시 조회 뒤에 채움
+//    (날짜가 들어간 HTML로 캐시 키를 만들면 같은 결과를 다시 받아도 매번 키가 달라짐)
+function buildPdfHtml(resultHtml) {
+    // 치환 문자열의 '$' 패턴이 해석되지 않도록 함수로 넘김
+    return PDF_TEMPLATE.replace('%RESULT%', () => resultHtml);
+}
+
+async function gzipBytes(text) {
+    const stream = new Blob([text]).stream().pipeThrough(new CompressionStream('gzip'));
+    return await new Response(stream).arrayBuffer();
+}
+
+self.onmessage = async (e) => {
+    const { id, html, now } = e.data;
+    
+    try {
+        const json = JSON.stringify({ html: buildPdfHtml(html), now });
+        
+        // CompressionStream이 없으면 압축 없이 그대로 전송
+        const gzip = typeof CompressionStream !== 'undefined';
+        const buffer = gzip ? await gzipBytes(json) : new TextEncoder().encode(json).buffer;
+        
+        // ArrayBuffer는 복사 없이 소유권만 넘김
+        self.postMessage({ id, buffer, gzip }, [buffer]);
+    } catch (error) {
+        self.postMessage({ id, error: error.message });
+    }
+};